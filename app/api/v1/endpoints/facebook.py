@@ -20,6 +20,7 @@ from app.models.product import Product
 from app.services.facebook_auth import facebook_auth_service
 from app.services.facebook_webhook import facebook_webhook_service
 from app.services.facebook_graph_api import facebook_graph_service
+from app.services.facebook_auto_reply import invalidate_seller_token
 from app.services import nlp_service
 from app.schemas.facebook import (
     FacebookConnectRequest,
@@ -661,22 +662,15 @@ async def facebook_callback(
         
         access_token = token_data["access_token"]
         
-        # 3. Récupérer les infos utilisateur
-        user_info = await facebook_auth_service.get_user_info(access_token)
+        # 3-4. Récupérer les infos utilisateur et les pages (en parallèle)
+        user_info, pages = await facebook_auth_service.get_user_info_and_pages(access_token)
         
         if not user_info or "id" not in user_info:
             raise HTTPException(
                 status_code=400,
                 detail="Impossible de récupérer les informations utilisateur Facebook"
             )
-        
-        # 4. Récupérer les pages
-        pages = []
-        try:
-            pages = await facebook_auth_service.get_user_pages(access_token)
-            logger.info(f"📄 {len(pages)} pages récupérées")
-        except Exception as pages_error:
-            logger.warning(f"⚠️ Pages non récupérées: {pages_error}")
+        logger.info(f"📄 {len(pages)} pages récupérées")
         
         # 5. Vérifier et parser le state (seller_id)
         try:
@@ -730,16 +724,16 @@ async def facebook_callback(
         for page_data in pages:
             # Vérifier si la page existe déjà
             existing_page = db.query(FacebookPage).filter(
-                FacebookPage.page_id == page_data["id"],
+                FacebookPage.page_id == page_data.id,
                 FacebookPage.seller_id == seller_id
             ).first()
             
             if existing_page:
                 # Mettre à jour la page existante
-                existing_page.name = page_data.get("name", "Page sans nom")
-                existing_page.category = page_data.get("category")
-                existing_page.fan_count = page_data.get("fan_count", 0)
-                existing_page.page_access_token = page_data.get("access_token", "")
+                existing_page.name = page_data.name
+                existing_page.category = page_data.category
+                existing_page.fan_count = page_data.fan_count
+                existing_page.page_access_token = page_data.access_token
                 existing_page.token_expires_at = facebook_auth_service.calculate_token_expiry(
                     60 * 24 * 60 * 60  # 60 jours
                 )
@@ -748,11 +742,11 @@ async def facebook_callback(
                 # Créer une nouvelle page
                 fb_page = FacebookPage(
                     id=uuid.uuid4(),
-                    page_id=page_data["id"],
-                    name=page_data.get("name", "Page sans nom"),
-                    category=page_data.get("category"),
-                    fan_count=page_data.get("fan_count", 0),
-                    page_access_token=page_data.get("access_token", ""),
+                    page_id=page_data.id,
+                    name=page_data.name,
+                    category=page_data.category,
+                    fan_count=page_data.fan_count,
+                    page_access_token=page_data.access_token,
                     token_expires_at=facebook_auth_service.calculate_token_expiry(
                         60 * 24 * 60 * 60
                     ),
@@ -766,6 +760,7 @@ async def facebook_callback(
                 db.add(fb_page)
         
         db.commit()
+        invalidate_seller_token(seller_id)
         
         # 8. Préparer la réponse
         user_info_data = {
@@ -780,11 +775,11 @@ async def facebook_callback(
         formatted_pages = []
         for page in pages:
             formatted_pages.append({
-                "page_id": page["id"],
-                "name": page.get("name", "Page sans nom"),
-                "category": page.get("category"),
-                "fan_count": page.get("fan_count", 0),
-                "access_token": page.get("access_token", ""),
+                "page_id": page.id,
+                "name": page.name,
+                "category": page.category,
+                "fan_count": page.fan_count,
+                "access_token": page.access_token,
                 "is_selected": False
             })
         
@@ -873,6 +868,7 @@ async def select_facebook_page(
         
         page.updated_at = datetime.utcnow()
         db.commit()
+        invalidate_seller_token(current_seller.id)
         db.refresh(page)
         
         return SelectPageResponse(
@@ -2032,6 +2028,7 @@ async def disconnect_facebook(
         db.delete(facebook_user)
         
         db.commit()
+        invalidate_seller_token(current_seller.id)
         
         return {
             "success": True,
@@ -10,6 +10,8 @@ from fastapi.responses import StreamingResponse
 import csv
 from io import StringIO
 
+import numpy as np
+
 from app.db import get_db
 from app.core.security import get_current_seller
 from app.models.product import Product
@@ -21,12 +23,35 @@ from app.models.facebook import (
 from app.schemas.reports import (
     ReportRequest,
     ReportResponse,
-    ExportFormat
+    ExportFormat,
+    select_top_products
 )
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def _top_post_summary(posts) -> Optional[Dict]:
+    """Résumé sérialisable du post ayant le plus de likes"""
+    if not posts:
+        return None
+    top = max(posts, key=lambda x: x.likes_count or 0)
+    return {
+        "id": str(top.id),
+        "facebook_post_id": top.facebook_post_id,
+        "message": top.message,
+        "likes_count": top.likes_count or 0
+    }
+
+def _count_per_day(items, start_date: datetime, n_days: int) -> np.ndarray:
+    """Nombre d'éléments par jour (index = jours depuis start_date)"""
+    start = start_date.date()
+    offsets = np.fromiter(
+        ((item.created_at.date() - start).days for item in items),
+        dtype=np.int64,
+        count=len(items)
+    )
+    return np.bincount(offsets, minlength=n_days)[:n_days]
+
 @router.post("/generate", response_model=ReportResponse)
 async def generate_report(
     request: ReportRequest,
@@ -40,39 +65,41 @@ async def generate_report(
         report_data = {}
         
         # Date range
-        if not request.end_date:
-            request.end_date = datetime.utcnow()
-        if not request.start_date:
-            request.start_date = request.end_date - timedelta(days=30)
+        end_date = request.end_date or datetime.utcnow()
+        start_date = request.start_date or end_date - timedelta(days=30)
         
         # Produits
         if "products" in request.sections:
             products = db.query(Product).filter(
                 Product.seller_id == current_seller.id,
-                Product.created_at >= request.start_date,
-                Product.created_at <= request.end_date
+                Product.created_at >= start_date,
+                Product.created_at <= end_date
             ).all()
             
             report_data["products"] = {
                 "total": len(products),
                 "by_category": {},
                 "stock_summary": {
-                    "total": sum(p.stock_quantity or 0 for p in products),
-                    "average": sum(p.stock_quantity or 0 for p in products) / len(products) if products else 0,
-                    "min": min((p.stock_quantity or 0) for p in products) if products else 0,
-                    "max": max((p.stock_quantity or 0) for p in products) if products else 0
+                    "total": sum(p.stock or 0 for p in products),
+                    "average": sum(p.stock or 0 for p in products) / len(products) if products else 0,
+                    "min": min((p.stock or 0) for p in products) if products else 0,
+                    "max": max((p.stock or 0) for p in products) if products else 0
                 },
                 "price_summary": {
-                    "total_value": sum((p.price or 0) * (p.stock_quantity or 0) for p in products),
+                    "total_value": sum((p.price or 0) * (p.stock or 0) for p in products),
                     "average": sum(p.price or 0 for p in products) / len(products) if products else 0,
                     "min": min((p.price or 0) for p in products) if products else 0,
                     "max": max((p.price or 0) for p in products) if products else 0
-                }
+                },
+                "top_products": select_top_products(
+                    products,
+                    score=lambda p: float(p.price or 0) * (p.stock or 0)
+                )
             }
             
             # Group by category
             for product in products:
-                category = product.category or "Non catégorisé"
+                category = product.category_name or "Non catégorisé"
                 if category not in report_data["products"]["by_category"]:
                     report_data["products"]["by_category"][category] = {
                         "count": 0,
@@ -81,8 +108,8 @@ async def generate_report(
                     }
                 
                 report_data["products"]["by_category"][category]["count"] += 1
-                report_data["products"]["by_category"][category]["total_stock"] += product.stock_quantity or 0
-                report_data["products"]["by_category"][category]["total_value"] += (product.price or 0) * (product.stock_quantity or 0)
+                report_data["products"]["by_category"][category]["total_stock"] += product.stock or 0
+                report_data["products"]["by_category"][category]["total_value"] += (product.price or 0) * (product.stock or 0)
         
         # Facebook
         if "facebook" in request.sections:
@@ -101,29 +128,29 @@ async def generate_report(
                 # Posts
                 posts = db.query(FacebookPost).filter(
                     FacebookPost.page_id == page.id,
-                    FacebookPost.created_at >= request.start_date,
-                    FacebookPost.created_at <= request.end_date
+                    FacebookPost.created_at >= start_date,
+                    FacebookPost.created_at <= end_date
                 ).all()
                 
                 # Comments
                 comments = db.query(FacebookComment).filter(
                     FacebookComment.page_id == page.id,
-                    FacebookComment.created_at >= request.start_date,
-                    FacebookComment.created_at <= request.end_date
+                    FacebookComment.created_at >= start_date,
+                    FacebookComment.created_at <= end_date
                 ).all()
                 
                 # Messages
                 messages = db.query(FacebookMessage).filter(
                     FacebookMessage.page_id == page.page_id,
-                    FacebookMessage.created_at >= request.start_date,
-                    FacebookMessage.created_at <= request.end_date
+                    FacebookMessage.created_at >= start_date,
+                    FacebookMessage.created_at <= end_date
                 ).all()
                 
                 # Lives
                 lives = db.query(FacebookLiveVideo).filter(
                     FacebookLiveVideo.page_id == page.page_id,
-                    FacebookLiveVideo.created_at >= request.start_date,
-                    FacebookLiveVideo.created_at <= request.end_date
+                    FacebookLiveVideo.created_at >= start_date,
+                    FacebookLiveVideo.created_at <= end_date
                 ).all()
                 
                 page_data = {
@@ -134,7 +161,7 @@ async def generate_report(
                     "messages": len(messages),
                     "lives": len(lives),
                     "engagement": len(comments) + len(messages),
-                    "top_post": max(posts, key=lambda x: x.likes_count or 0) if posts else None
+                    "top_post": _top_post_summary(posts)
                 }
                 
                 facebook_data["pages"].append(page_data)
@@ -152,8 +179,8 @@ async def generate_report(
         return ReportResponse(
             report_id=f"report_{int(datetime.utcnow().timestamp())}",
             generated_at=datetime.utcnow(),
-            period_start=request.start_date,
-            period_end=request.end_date,
+            period_start=start_date,
+            period_end=end_date,
             sections=request.sections,
             data=report_data,
             summary={
@@ -357,23 +384,23 @@ async def monthly_report(
             FacebookMessage.created_at <= end_date
         ).all()
         
-        # Analyse par jour
+        # Analyse par jour : un comptage vectorisé par type au lieu
+        # d'un parcours complet des listes pour chaque jour du mois
+        n_days = (end_date - start_date).days + 1
+        day_products = _count_per_day(monthly_products, start_date, n_days)
+        day_comments = _count_per_day(monthly_comments, start_date, n_days)
+        day_messages = _count_per_day(monthly_messages, start_date, n_days)
+        
         daily_stats = {}
-        current = start_date
-        while current <= end_date:
-            day_str = current.strftime("%Y-%m-%d")
-            
-            day_products = len([p for p in monthly_products if p.created_at.date() == current.date()])
-            day_comments = len([c for c in monthly_comments if c.created_at.date() == current.date()])
-            day_messages = len([m for m in monthly_messages if m.created_at.date() == current.date()])
-            
+        for offset, (products, comments, messages) in enumerate(zip(
+            day_products.tolist(), day_comments.tolist(), day_messages.tolist()
+        )):
+            day_str = (start_date + timedelta(days=offset)).strftime("%Y-%m-%d")
             daily_stats[day_str] = {
-                "products": day_products,
-                "comments": day_comments,
-                "messages": day_messages,
+                "products": products,
+                "comments": comments,
+                "messages": messages,
             }
-            
-            current += timedelta(days=1)
         
         return daily_stats
 
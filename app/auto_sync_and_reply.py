@@ -43,7 +43,7 @@ def make_request(method, endpoint, **kwargs):
         
         # Pour debug: affiche l'erreur 500
         if response.status_code == 500:
-            logger.error(f"Erreur 500 pour {endpoint}: {response.text[:200]}")
+            logger.error(f"Erreur 500 pour {endpoint}: {response.content[:200].decode('utf-8', errors='replace')}")
         
         response.raise_for_status()
         return response.json()
@@ -63,6 +63,11 @@ class Settings(BaseSettings):
     FROM_EMAIL: str = "noreply@livecommerce.com"
     FROM_NAME: str = "Live Commerce"
     DISABLE_EMAIL_SENDING: bool = False
+    # Pool de connexions SMTP (désactivé par défaut)
+    SMTP_POOL_ENABLED: bool = False
+    SMTP_POOL_SIZE: int = 4
+    SMTP_MAX_USES_PER_CONN: int = 100
+    SMTP_MAX_CONN_AGE: float = 300
     SENDGRID_API_KEY: Optional[str] = None
 
     # ======================================================
@@ -193,6 +198,8 @@ class Settings(BaseSettings):
     FACEBOOK_WEBHOOK_VERIFY_TOKEN: Optional[str] = None
     FACEBOOK_WEBHOOK_SECRET: Optional[str] = None
     FACEBOOK_SCOPES: str = "pages_show_list,pages_read_engagement,pages_manage_metadata,pages_manage_posts,pages_manage_engagement,public_profile,email,pages_read_user_content,business_management,pages_messaging"
+    # Toujours échanger contre un token long-lived, même si le premier token dure déjà ~60 jours
+    FACEBOOK_FORCE_LONG_LIVED: bool = False
 
     @property
     def FACEBOOK_APP_REDIRECT_URI(self) -> str:
@@ -1,5 +1,7 @@
 # app/db.py - VERSION ULTRA SIMPLE
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 
@@ -23,6 +25,37 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine)
 Base = declarative_base()
 
+def _to_async_url(url: str):
+    """Même base, via le driver asyncpg (postgresql+asyncpg://...)"""
+    async_url = make_url(url)
+    async_url = async_url.set(drivername="postgresql+asyncpg")
+    # asyncpg ne connaît pas `sslmode` (libpq) : il attend `ssl`
+    if "sslmode" in async_url.query:
+        sslmode = async_url.query["sslmode"]
+        async_url = async_url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return async_url
+
+_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1024"))
+
+# Moteur async (asyncpg) pour les services qui ne doivent pas bloquer la boucle d'événements.
+# Pool par processus : workers × (DB_POOL_SIZE + DB_MAX_OVERFLOW) doit rester
+# sous le max_connections de PostgreSQL.
+async_engine = create_async_engine(
+    _to_async_url(DATABASE_URL),
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    pool_pre_ping=True,  # Connexions coupées par le serveur détectées avant usage
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),  # secondes
+    query_cache_size=1200,  # SQL compilé mis en cache par statement (défaut: 500)
+    connect_args={
+        # Requêtes préparées gardées par connexion (asyncpg + SQLAlchemy).
+        # Mettre 0 derrière pgbouncer/Supavisor en mode transaction.
+        "statement_cache_size": _STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": _STATEMENT_CACHE_SIZE,
+    },
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 def get_db():
     """Dépendance sync ultra simple"""
     db = SessionLocal()
@@ -31,6 +64,11 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Dépendance async (AsyncSession)"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Fonction pour tester la connexion
 def test_connection():
     """Teste la connexion à la base"""
@@ -967,6 +967,26 @@ async def shutdown_event():
     """Événement d'arrêt de l'application"""
     logger.info("🛑 Application Live Commerce API arrêtée")
     
+    # Écrire les historiques de réponses Facebook encore en file
+    from app.services.facebook_auto_reply import close_reply_history_writer
+    await close_reply_history_writer()
+    
+    # Fermer le pool de connexions partagé des services Facebook
+    from app.services.facebook_http import close_shared_client
+    await close_shared_client()
+    
+    # Fermer les connexions SMTP réutilisées
+    from app.services.email_service import close_smtp_pool
+    close_smtp_pool()
+    
+    # Géocoder les livreurs encore en file (avant de fermer le pool asyncpg)
+    from app.services.driver_service import close_geocode_worker
+    await close_geocode_worker()
+    
+    # Fermer le pool de connexions async (asyncpg)
+    from app.db import async_engine
+    await async_engine.dispose()
+    
     if services_loaded.get("facebook_graph"):
         try:
             from app.services.facebook_graph_api import FacebookGraphAPIService
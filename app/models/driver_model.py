@@ -1,24 +1,40 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.db import Base
 import uuid
-from datetime import datetime
 
 class Driver(Base):
     __tablename__ = "drivers"
+    # Valeurs générées par la base (created_at/updated_at) relues via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False)
     seller_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     zone_livraison = Column(String(255))
     disponibilite = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # now() est aussi émis dans l'INSERT (default=) : les bases créées avant le
+    # server_default n'ont pas de DEFAULT sur ces colonnes tant que
+    # app/scripts/migrate_timestamp_defaults.py n'a pas été exécuté
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relations
     user = relationship("User", foreign_keys=[user_id], backref="driver_profile")
     seller_user = relationship("User", foreign_keys=[seller_id], backref="sellers_drivers")
     
+    __table_args__ = (
+        # Agrégats par zone d'un vendeur (get_available_zones)
+        Index('idx_drivers_seller_zone', 'seller_id', 'zone_livraison'),
+        # Listes/recherches par vendeur triées par date, pagination par curseur (created_at, id)
+        Index(
+            'idx_drivers_seller_created',
+            'seller_id', text('created_at DESC'), text('id DESC'),
+            postgresql_include=['user_id', 'disponibilite', 'zone_livraison'],
+        ),
+    )
+    
     def __repr__(self):
         return f"<Driver(id={self.id}, user_id={self.user_id}, seller_id={self.seller_id})>"
\ No newline at end of file
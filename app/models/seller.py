@@ -3,12 +3,15 @@
 from sqlalchemy import Column, Text, TIMESTAMP, Date, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.db import Base
 import uuid
 from datetime import datetime
 
 class Seller(Base):
     __tablename__ = "sellers"
+    # Valeurs générées par la base (created_at/updated_at) relues via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, unique=True)
@@ -19,8 +22,11 @@ class Seller(Base):
     abonnement_status = Column(Text, default="actif")
     date_debut_abonnement = Column(Date, default=datetime.now().date)
     date_fin_abonnement = Column(Date, default=datetime.now().date)
-    created_at = Column(TIMESTAMP, default=datetime.now)
-    updated_at = Column(TIMESTAMP, default=datetime.now, onupdate=datetime.now)
+    # now() est aussi émis dans l'INSERT (default=) : les bases créées avant le
+    # server_default n'ont pas de DEFAULT sur ces colonnes tant que
+    # app/scripts/migrate_timestamp_defaults.py n'a pas été exécuté
+    created_at = Column(TIMESTAMP, default=func.now(), server_default=func.now())
+    updated_at = Column(TIMESTAMP, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # ✅ CORRECTION: Relations SIMPLIFIÉES
     user = relationship("User", back_populates="seller")
@@ -1,12 +1,14 @@
 from sqlalchemy import Column, String, Text, TIMESTAMP, Boolean, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.db import Base
 import uuid
-from datetime import datetime
 
 class User(Base):
     __tablename__ = "users"
+    # Valeurs générées par la base (created_at/updated_at) relues via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     full_name = Column(Text, nullable=False)
@@ -16,8 +18,11 @@ class User(Base):
     role = Column(Text, nullable=False)  # 'ADMIN', 'VENDEUR', 'LIVREUR', 'client'
     statut = Column(Text, default="en_attente")  # 'en_attente', 'actif', 'suspendu', 'rejeté'
     password = Column(Text, nullable=False)
-    created_at = Column(TIMESTAMP, default=datetime.now)
-    updated_at = Column(TIMESTAMP, default=datetime.now, onupdate=datetime.now)
+    # now() est aussi émis dans l'INSERT (default=) : les bases créées avant le
+    # server_default n'ont pas de DEFAULT sur ces colonnes tant que
+    # app/scripts/migrate_timestamp_defaults.py n'a pas été exécuté
+    created_at = Column(TIMESTAMP, default=func.now(), server_default=func.now())
+    updated_at = Column(TIMESTAMP, default=func.now(), server_default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True)
     
     # Relation avec Seller (si c'est un vendeur)
@@ -468,7 +468,7 @@ async def forgot_password(forgot_data: ForgotPasswordSchema, db: Session = Depen
         
         # 5. Envoyer l'email (silencieusement)
         try:
-            email_service.send_reset_code_email(user.email, reset_code)
+            await email_service.send_reset_code_email_async(user.email, reset_code)
         except Exception as email_error:
             # Log l'erreur mais ne pas l'exposer à l'utilisateur
             print(f"Email error: {email_error}")
@@ -1,6 +1,7 @@
 
 # app/routers/drivers.py - Version corrigée
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy import Integer, func, or_
 from sqlalchemy.orm import Session
 from typing import List, Optional
@@ -8,12 +9,13 @@ from uuid import UUID
 import uuid
 from datetime import datetime
 
-from app.db import get_db
+from app.db import get_db, AsyncSessionLocal
 from app.core.security import get_current_user, get_password_hash
 from app.models.driver_model import Driver
 from app.models.user import User
 from app.services.geocoding_service import geocoding_service
 from app.services.email_service import EmailService
+from app.services.driver_service import DriverService
 
 router = APIRouter(prefix="/api/v1/drivers", tags=["Drivers"])
 
@@ -825,6 +827,29 @@ async def get_drivers(
             detail=f"Erreur récupération livreurs: {str(e)}"
         )
 
+@router.get("/export")
+async def export_drivers(
+    statut: Optional[str] = Query(None, description="Filtrer par statut"),
+    disponibilite: Optional[bool] = Query(None, description="Filtrer par disponibilité"),
+    zone: Optional[str] = Query(None, description="Filtrer par zone de livraison"),
+    current_user: dict = Depends(get_current_seller)
+):
+    """
+    Exporte tous les livreurs du vendeur connecté en NDJSON (une ligne JSON par
+    livreur), lus par lots depuis un curseur serveur sans tout charger en mémoire
+    """
+    seller_id = UUID(current_user["user_id"])
+    
+    async def ndjson_lines():
+        # Session ouverte pendant toute la durée du flux
+        async with AsyncSessionLocal() as db:
+            async for item in DriverService.stream_seller_driver_items(
+                db, seller_id, statut=statut, disponibilite=disponibilite, zone=zone
+            ):
+                yield item.model_dump_json() + "\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
 @router.get("/{driver_id}")
 async def get_driver(
     driver_id: str,
@@ -1,8 +1,21 @@
 # app/schemas/reports.py
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Any, Callable, Dict, Iterable, List, Optional
+from pydantic import (
+    AfterValidator, BaseModel, ConfigDict, Field, SerializerFunctionWrapHandler,
+    field_serializer, validator
+)
 from enum import Enum
+import heapq
+import re
+
+# Fréquences autorisées, compilées une seule fois au chargement du module
+_FREQUENCY_RE = re.compile(r"^(daily|weekly|monthly|quarterly|yearly)$")
+
+def _check_frequency(v: str) -> str:
+    if not _FREQUENCY_RE.match(v):
+        raise ValueError(f"Fréquence invalide: {v}")
+    return v
 
 # Enum pour les formats d'export
 class ExportFormat(str, Enum):
@@ -53,6 +66,33 @@ class ReportRequest(BaseModel):
                 raise ValueError("La date de fin doit être après la date de début")
         return v
 
+# Élément d'un classement "top produits" (taille fixe, immuable)
+class TopProduct(BaseModel):
+    id: str
+    name: str
+    score: float = Field(0.0, description="Score de classement")
+    
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+def select_top_products(
+    items: Iterable[Any],
+    score: Callable[[Any], float],
+    k: int = 10
+) -> List[TopProduct]:
+    """
+    Retourne les k meilleurs éléments selon `score`.
+    Le tri se fait sur des tuples (heapq) ; seuls les k gagnants
+    sont convertis en TopProduct.
+    """
+    best = heapq.nlargest(
+        k,
+        ((score(item), -index, item) for index, item in enumerate(items))
+    )
+    return [
+        TopProduct.model_construct(id=str(item.id), name=item.name, score=float(item_score))
+        for item_score, _, item in best
+    ]
+
 # Schéma pour les statistiques de produits
 class ProductStats(BaseModel):
     total: int = Field(0, description="Nombre total de produits")
@@ -68,7 +108,7 @@ class ProductStats(BaseModel):
         default_factory=dict,
         description="Résumé des prix"
     )
-    top_products: List[Dict[str, Any]] = Field(
+    top_products: List[TopProduct] = Field(
         default_factory=list,
         description="Top produits par performance"
     )
@@ -90,6 +130,9 @@ class FacebookPageData(BaseModel):
         None,
         description="Nombre de fans de la page"
     )
+    
+    # Une instance par page : immuable et sans champs supplémentaires
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
 class FacebookStats(BaseModel):
     pages: List[FacebookPageData] = Field(
@@ -115,7 +158,7 @@ class SalesStats(BaseModel):
     total_orders: int = Field(0, description="Nombre total de commandes")
     total_revenue: float = Field(0.0, description="Revenu total")
     average_order_value: float = Field(0.0, description="Valeur moyenne des commandes")
-    top_products: List[Dict[str, Any]] = Field(
+    top_products: List[TopProduct] = Field(
         default_factory=list,
         description="Top produits vendus"
     )
@@ -159,6 +202,16 @@ class EngagementStats(BaseModel):
         description="Analyse de sentiment"
     )
 
+# Données du rapport : un champ fixe par section.
+# Le contenu d'une section reste libre : la réponse garde exactement
+# les clés produites par l'endpoint, sans valeurs par défaut ajoutées
+class ReportData(BaseModel):
+    products: Optional[Dict[str, Any]] = None
+    facebook: Optional[Dict[str, Any]] = None
+    sales: Optional[Dict[str, Any]] = None
+    inventory: Optional[Dict[str, Any]] = None
+    engagement: Optional[Dict[str, Any]] = None
+
 # Schéma de réponse du rapport
 class ReportResponse(BaseModel):
     report_id: str = Field(..., description="ID unique du rapport")
@@ -168,8 +221,8 @@ class ReportResponse(BaseModel):
     sections: List[ReportSection] = Field(..., description="Sections incluses")
     
     # Données principales
-    data: Dict[ReportSection, Any] = Field(
-        default_factory=dict,
+    data: ReportData = Field(
+        default_factory=ReportData,
         description="Données du rapport par section"
     )
     
@@ -195,16 +248,14 @@ class ReportResponse(BaseModel):
         description="Métadonnées du rapport"
     )
     
-    @validator('data')
-    def validate_data_sections(cls, v, values):
-        if 'sections' in values:
-            for section in values['sections']:
-                if section not in v:
-                    v[section] = {}
-        return v
-    
-    class Config:
-        use_enum_values = True
+    @field_serializer('data', mode='wrap')
+    def serialize_data(self, data: ReportData, handler: SerializerFunctionWrapHandler) -> Dict[str, Any]:
+        # Forme publique inchangée : uniquement les sections produites,
+        # et {} pour chaque section demandée sans données
+        serialized = {key: value for key, value in handler(data).items() if value is not None}
+        for section in self.sections:
+            serialized.setdefault(section.value, {})
+        return serialized
 
 # Schéma pour les rapports mensuels
 class DailyStats(BaseModel):
@@ -213,8 +264,8 @@ class DailyStats(BaseModel):
     messages: int = Field(0, description="Messages Facebook")
     engagement: int = Field(0, description="Engagement total")
     
-    class Config:
-        from_attributes = True
+    # Une instance par jour : immuable et sans champs supplémentaires
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="forbid")
 
 class MonthlyReport(BaseModel):
     year: int
@@ -273,9 +324,8 @@ class ExportResponse(BaseModel):
 # Schéma pour les rapports programmés
 class ScheduledReport(BaseModel):
     name: str = Field(..., max_length=100, description="Nom du rapport")
-    frequency: str = Field(
+    frequency: Annotated[str, AfterValidator(_check_frequency)] = Field(
         ...,
-        pattern="^(daily|weekly|monthly|quarterly|yearly)$",
         description="Fréquence de génération"
     )
     sections: List[ReportSection]
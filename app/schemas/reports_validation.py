@@ -1,8 +1,17 @@
 # app/schemas/reports_validation.py
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any
 from pydantic import BaseModel, validator
 
+# Filtres autorisés (construit une seule fois au chargement du module)
+_ALLOWED_FILTERS = frozenset({
+    'category', 'price_min', 'price_max', 'stock_min', 'stock_max',
+    'engagement_min', 'engagement_max', 'sentiment', 'status'
+})
+
+# Limite de période (2 ans maximum)
+_MAX_LOOKBACK = timedelta(days=365 * 2)
+
 class ReportValidation(BaseModel):
     """Validations supplémentaires pour les rapports"""
     
@@ -11,21 +20,15 @@ class ReportValidation(BaseModel):
         if start_date > end_date:
             raise ValueError("La date de début doit être avant la date de fin")
         
-        # Limite de période (2 ans maximum)
-        max_period = datetime.now().replace(year=datetime.now().year - 2)
-        if start_date < max_period:
+        # Un seul appel à datetime.now() ; pas de replace(year=...) qui échoue un 29 février
+        if datetime.now() - start_date > _MAX_LOOKBACK:
             raise ValueError("La période ne peut pas dépasser 2 ans dans le passé")
     
     @classmethod
     def validate_filters(cls, filters: Dict[str, Any]) -> None:
-        allowed_filters = {
-            'category', 'price_min', 'price_max', 'stock_min', 'stock_max',
-            'engagement_min', 'engagement_max', 'sentiment', 'status'
-        }
-        
-        for key in filters.keys():
-            if key not in allowed_filters:
-                raise ValueError(f"Filtre non autorisé: {key}")
+        bad = filters.keys() - _ALLOWED_FILTERS
+        if bad:
+            raise ValueError(f"Filtres non autorisés: {sorted(bad)}")
     
     @classmethod
     def validate_export_data(cls, data: Dict[str, Any], format: str) -> None:
@@ -1,8 +1,31 @@
 # app/schemas.py - Version complète
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional, List, Dict, Any
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, Field, field_validator
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
+import re
+
+# Caractères ignorés lors de la validation d'un numéro de téléphone
+_PHONE_STRIP = str.maketrans('', '', ' -.()')
+
+# Valeurs autorisées, compilées une seule fois au chargement du module
+_STATUT_RE = re.compile(r"^(en_attente|actif|suspendu|rejeté)$")
+_DRIVER_ACTION_RE = re.compile(r"^(activate|suspend|delete)$")
+_ABONNEMENT_TYPE_RE = re.compile(r"^(gratuit|premium|business)$")
+_ABONNEMENT_STATUS_RE = re.compile(r"^(actif|expire|en_attente)$")
+
+def _matches(pattern: re.Pattern, label: str) -> AfterValidator:
+    """Validateur appelant directement une regex précompilée"""
+    def check(v: str) -> str:
+        if not pattern.match(v):
+            raise ValueError(f"{label} invalide: {v}")
+        return v
+    return AfterValidator(check)
+
+StatutStr = Annotated[str, _matches(_STATUT_RE, "Statut")]
+DriverActionStr = Annotated[str, _matches(_DRIVER_ACTION_RE, "Action")]
+AbonnementTypeStr = Annotated[str, _matches(_ABONNEMENT_TYPE_RE, "Type d'abonnement")]
+AbonnementStatusStr = Annotated[str, _matches(_ABONNEMENT_STATUS_RE, "Statut d'abonnement")]
 
 # ============ USER SCHEMAS ============
 class UserBase(BaseModel):
@@ -10,6 +33,9 @@ class UserBase(BaseModel):
     email: EmailStr = Field(..., description="Email de l'utilisateur")
     telephone: str = Field(..., min_length=8, max_length=20, description="Numéro de téléphone")
     adresse: str = Field(..., min_length=5, max_length=255, description="Adresse complète")
+    
+    # EmailStr charge email_validator : le schéma n'est construit qu'à la première validation
+    model_config = ConfigDict(defer_build=True)
 
 class UserCreate(UserBase):
     """Schéma pour créer un utilisateur"""
@@ -28,8 +54,8 @@ class UserCreate(UserBase):
     @classmethod
     def validate_telephone(cls, v: str) -> str:
         # Enlever les espaces et caractères spéciaux pour validation
-        cleaned = v.replace(' ', '').replace('-', '').replace('.', '').replace('(', '').replace(')', '')
-        if not cleaned.replace('+', '').isdigit():
+        cleaned = v.translate(_PHONE_STRIP)
+        if not cleaned.lstrip('+').isdigit():
             raise ValueError('Numéro de téléphone invalide')
         return v
 
@@ -38,7 +64,7 @@ class UserUpdate(BaseModel):
     full_name: Optional[str] = Field(None, min_length=2, max_length=100)
     telephone: Optional[str] = Field(None, min_length=8, max_length=20)
     adresse: Optional[str] = Field(None, min_length=5, max_length=255)
-    statut: Optional[str] = Field(None, pattern="^(en_attente|actif|suspendu|rejeté)$")
+    statut: Optional[StatutStr] = Field(None)
     is_active: Optional[bool] = None
     
     class Config:
@@ -46,6 +72,12 @@ class UserUpdate(BaseModel):
 
 class UserResponse(UserBase):
     """Schéma de réponse pour un utilisateur"""
+    # Pas de contraintes en sortie : /auth/register accepte un nom d'un
+    # caractère, et les colonnes telephone/adresse sont nullables ou vides
+    full_name: str
+    email: str
+    telephone: Optional[str] = None
+    adresse: Optional[str] = None
     id: UUID
     role: str
     statut: str
@@ -80,6 +112,8 @@ class DriverCreateSimple(BaseModel):
     statut: str = Field(default="en_attente")
     zone_livraison: Optional[str] = Field(None, max_length=255)
     
+    model_config = ConfigDict(defer_build=True)
+    
     @field_validator('role')
     @classmethod
     def validate_role(cls, v: str) -> str:
@@ -105,12 +139,14 @@ class DriverResponse(DriverBase):
     updated_at: datetime
     user: Optional[UserResponse] = None
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        defer_build=True,
+        json_encoders={
             UUID: str,
             datetime: lambda dt: dt.isoformat()
         }
+    )
 
 # ============ DRIVER LIST & STATS SCHEMAS ============
 class DriverListItem(BaseModel):
@@ -129,12 +165,16 @@ class DriverListItem(BaseModel):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
+    # Instancié en grand nombre : immuable et sans champs supplémentaires
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        extra="forbid",
+        json_encoders={
             UUID: str,
             datetime: lambda dt: dt.isoformat()
         }
+    )
 
 class DriversListResponse(BaseModel):
     """Réponse pour la liste des livreurs"""
@@ -149,6 +189,8 @@ class LoginRequest(BaseModel):
     """Schéma pour la connexion"""
     email: EmailStr = Field(..., description="Email de l'utilisateur")
     password: str = Field(..., min_length=6, description="Mot de passe")
+    
+    model_config = ConfigDict(defer_build=True)
 
 class TokenResponse(BaseModel):
     """Réponse avec token JWT"""
@@ -191,14 +233,14 @@ class ErrorResponse(BaseModel):
 # ============ DRIVER STATUS SCHEMAS ============
 class DriverStatusUpdate(BaseModel):
     """Schéma pour changer le statut d'un livreur"""
-    action: str = Field(..., pattern="^(activate|suspend|delete)$", description="Action: activate, suspend, delete")
+    action: DriverActionStr = Field(..., description="Action: activate, suspend, delete")
 
 # ============ SELLER SCHEMAS ============
 class SellerBase(BaseModel):
     company_name: str = Field(..., min_length=2, max_length=100, description="Nom de l'entreprise")
     facebook_page: Optional[str] = Field(None, description="Page Facebook")
-    abonnement_type: str = Field(default="gratuit", pattern="^(gratuit|premium|business)$", description="Type d'abonnement")
-    abonnement_status: str = Field(default="actif", pattern="^(actif|expire|en_attente)$", description="Statut de l'abonnement")
+    abonnement_type: AbonnementTypeStr = Field(default="gratuit", description="Type d'abonnement")
+    abonnement_status: AbonnementStatusStr = Field(default="actif", description="Statut de l'abonnement")
 
 class SellerCreate(SellerBase):
     user_id: UUID = Field(..., description="ID de l'utilisateur vendeur")
@@ -210,12 +252,14 @@ class SellerResponse(SellerBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
+    model_config = ConfigDict(
+        from_attributes=True,
+        defer_build=True,
+        json_encoders={
             UUID: str,
             datetime: lambda dt: dt.isoformat()
         }
+    )
 
 # ============ DRIVER STATISTICS ============
 class DriverStatsResponse(BaseModel):
@@ -233,6 +277,8 @@ class ZoneStats(BaseModel):
     total: int = Field(..., description="Nombre total de livreurs")
     disponibles: int = Field(..., description="Nombre de livreurs disponibles")
     indisponibles: int = Field(..., description="Nombre de livreurs indisponibles")
+    
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
 class ZonesResponse(BaseModel):
     """Liste des zones avec statistiques"""
@@ -1,32 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
-from datetime import datetime
-import uuid
+# app/schemas/user.py
+# Les schémas utilisateur sont définis une seule fois dans app/schemas/schemas.py
+from .schemas import UserBase, UserCreate, UserResponse, UserUpdate
 
-class UserBase(BaseModel):
-    email: EmailStr
-    full_name: Optional[str] = None
-    telephone: Optional[str] = None
-    role: Optional[str] = None
-    adresse: Optional[str] = None
-
-class UserCreate(UserBase):
-    password: str
-
-class UserResponse(BaseModel):
-    id: uuid.UUID
-    email: EmailStr
-    full_name: Optional[str]
-    telephone: Optional[str]
-    role: Optional[str]
-    adresse: Optional[str]
-    created_at: Optional[datetime]
-    updated_at: Optional[datetime]
-
-    class Config:
-        from_attributes = True
-
-class UserUpdate(BaseModel):
-    full_name: Optional[str] = None
-    telephone: Optional[str] = None
-    adresse: Optional[str] = None
\ No newline at end of file
+__all__ = ["UserBase", "UserCreate", "UserResponse", "UserUpdate"]
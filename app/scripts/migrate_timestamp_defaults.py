@@ -0,0 +1,48 @@
+# scripts/migrate_timestamp_defaults.py
+"""
+Aligne une base existante sur les modèles : create_all() ne modifie pas
+les tables déjà créées, donc les DEFAULT now() et les index ajoutés depuis
+doivent être appliqués à la main.
+
+Usage (depuis la racine du projet) :
+    python -m app.scripts.migrate_timestamp_defaults
+
+Idempotent : peut être relancé sans effet de bord.
+"""
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+from app.db import engine
+from app.models import Driver
+
+# Tables dont created_at/updated_at sont horodatés par PostgreSQL
+_TIMESTAMP_TABLES = ("users", "sellers", "drivers")
+
+# Index déclarés sur les modèles après la création des tables
+# (idx_drivers_seller_zone, idx_drivers_seller_created)
+_INDEXED_TABLES = (Driver.__table__,)
+
+def _timestamp_statements(table: str):
+    return (
+        # Lignes insérées sans horodatage entre le déploiement et la migration
+        f"UPDATE {table} SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL",
+        f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL",
+        f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()",
+        f"ALTER TABLE {table} ALTER COLUMN updated_at SET DEFAULT now()",
+    )
+
+def migrate():
+    with engine.begin() as conn:
+        for table in _TIMESTAMP_TABLES:
+            for statement in _timestamp_statements(table):
+                conn.execute(text(statement))
+            print(f"✅ {table}: DEFAULT now() sur created_at/updated_at")
+        
+        for table in _INDEXED_TABLES:
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                conn.execute(CreateIndex(index, if_not_exists=True))
+                print(f"✅ Index {index.name}")
+    print("🎉 Migration terminée")
+
+if __name__ == "__main__":
+    migrate()
@@ -2,7 +2,11 @@ from .email_service import EmailService, email_service
 from .geocoding_service_madagascar import geocoding_service_mg as geocoding_service
 
 # app/services/__init__.py
+import importlib
 import logging
+import sys
+import types
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -10,20 +14,20 @@ logger = logging.getLogger(__name__)
 from .facebook_auth import FacebookAuthService
 from .facebook_webhook import FacebookWebhookService
 from .facebook_graph_api import FacebookGraphAPIService
-from .nlp_service import NLPService
 
-# Configuration commune
-DEFAULT_NLP_CONFIG = {
+# Configuration commune (lecture seule : partagée par tous les services,
+# une modification dans l'un ne doit pas se répercuter sur les autres)
+DEFAULT_NLP_CONFIG = types.MappingProxyType({
     "NER_PHONE_PATTERNS": [
         r'\b(?:034|032|033|038|020|021)\s?\d{2}\s?\d{3}\s?\d{2}\b',
         r'\b\d{3}[-.\s]?\d{2}[-.\s]?\d{3}[-.\s]?\d{2}\b'
     ],
     "NER_EMAIL_PATTERN": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
     "NER_PRICE_PATTERN": r'(?:(?:\d{1,3}(?:[.,]\d{3})*|\d+)(?:[.,]\d{2})?)\s*(?:Ar|MGA|€|EUR|\$|USD)'
-}
+})
 
 # Configuration OCR (si disponible)
-OCR_CONFIG = {
+OCR_CONFIG = types.MappingProxyType({
     "temp_dir": "./temp_ocr",
     "max_file_size": 10 * 1024 * 1024,  # 10MB
     "supported_formats": ["image/jpeg", "image/png", "application/pdf"],
@@ -32,245 +36,270 @@ OCR_CONFIG = {
     "MAX_CONCURRENT_OCR": 4,
     "OCR_TIMEOUT": 30,
     "preprocess_image": True  # Ajouté pour activer le prétraitement
-}
+})
 
 # ==============================================
-# SERVICE OCR - CORRECTION PRINCIPALE
+# SERVICES DE SECOURS (utilisés si l'import échoue)
 # ==============================================
-OCRServiceClass = None  # Initialiser à None
-try:
-    from .ocr_service import OCRService as OCRServiceClass
-    OCR_SERVICE_AVAILABLE = True
-    # ⭐ CORRECTION : Créer une INSTANCE, pas assigner la classe
-    ocr_service_instance = OCRServiceClass(config=OCR_CONFIG)  # INSTANCE
-    logger.info("✅ Service OCR disponible et initialisé")
-except ImportError as e:
-    OCR_SERVICE_AVAILABLE = False
-    logger.warning(f"⚠️ Service OCR non disponible: {e}")
-    # Créer un service factice COMPLET
-    class OCRServiceDummy:
-        def __init__(self, config=None):
-            self.available = False
-            self.name = "OCRService (Dummy)"
-            self.config = config or {}
-            self.ocr_engine = None
-        
-        # ⭐ CORRECTION : Ajouter TOUTES les méthodes nécessaires
-        def extract_from_image(self, image_path: str, language: str = None):
-            raise ImportError("OCRService non disponible. Installer paddleocr.")
-        
-        def extract_from_pdf(self, pdf_path: str, language: str = None):
-            raise ImportError("OCRService non disponible.")
-        
-        def extract_from_docx(self, docx_path: str):
-            raise ImportError("OCRService non disponible.")
-        
-        def extract_from_excel(self, excel_path: str):
-            raise ImportError("OCRService non disponible.")
-        
-        def process_document(self, file_path: str, language: str = None):
-            return {
-                'success': False,
-                'file_type': 'unknown',
-                'text': "",
-                'confidence': 0.0,
-                'pages': [],
-                'processing_time': 0.0,
-                'error': 'OCRService non disponible. Installer paddleocr.'
-            }
-        
-        def detect_file_type(self, file_path: str):
-            return "unknown"
-        
-        # Ancienne méthode (pour compatibilité)
-        def extract_text(self, *args, **kwargs):
-            raise ImportError("OCRService non disponible.")
-        
-        def __call__(self, *args, **kwargs):
-            raise ImportError("OCRService non disponible.")
-    
-    # Définir OCRServiceClass pour l'export
-    OCRServiceClass = OCRServiceDummy
-    ocr_service_instance = OCRServiceDummy(config=OCR_CONFIG)  # INSTANCE
+# Objets sentinelles partagés (sans état) : une seule instance par service,
+# réutilisée partout, au lieu d'une instance de classe "Dummy" par appelant.
+def _unavailable(service_name: str, message: str = None):
+    """Fabrique une méthode qui lève ImportError pour un service absent"""
+    message = message or f"{service_name} non disponible."
+    def _raise(*args, **kwargs):
+        raise ImportError(message)
+    return _raise
+
+def _dummy_process_document(file_path: str, language: str = None):
+    return {
+        'success': False,
+        'file_type': 'unknown',
+        'text': "",
+        'confidence': 0.0,
+        'pages': [],
+        'processing_time': 0.0,
+        'error': 'OCRService non disponible. Installer paddleocr.'
+    }
+
+def _dummy_detect_file_type(file_path: str):
+    return "unknown"
+
+def _dummy_parse_form_fields(text, language):
+    return {}
+
+def _dummy_detect_form_type(text, language):
+    return "unknown"
+
+def _dummy_calculate_form_completeness(fields, form_type):
+    return 0
+
+def _dummy_detect_handwriting(image_path):
+    return False
+
+def _dummy_detect(text):
+    return "fr"  # Français par défaut
+
+def _dummy_detect_with_confidence(text):
+    return ("fr", 1.0)  # Pour compatibilité
+
+def _dummy_detect_multiple(texts):
+    return ["fr"] * len(texts) if texts else []
+
+def _dummy_build_order_structure(nlp_data, form_fields=None):
+    return {}
+
+def _dummy_prepare_for_order_service(order_structure):
+    return {}
+
+def _dummy_extract_entities(*args, **kwargs):
+    return []
+
+def _dummy_extract_all(text, language="fr"):
+    return {
+        "text": text,
+        "language": language,
+        "intent": "OTHER",
+        "intent_confidence": 0.0,
+        "phone_numbers": [],
+        "emails": [],
+        "first_name": "",
+        "last_name": "",
+        "address": {},
+        "order_items": [],
+        "prices": [],
+        "processing_time": 0.0
+    }
+
+def _dummy_analyze_sentiment(*args, **kwargs):
+    return "neutral"
+
+_OCR_SERVICE_DUMMY = types.SimpleNamespace(
+    available=False,
+    name="OCRService (Dummy)",
+    config=OCR_CONFIG,
+    ocr_engine=None,
+    extract_from_image=_unavailable("OCRService", "OCRService non disponible. Installer paddleocr."),
+    extract_from_pdf=_unavailable("OCRService"),
+    extract_from_docx=_unavailable("OCRService"),
+    extract_from_excel=_unavailable("OCRService"),
+    process_document=_dummy_process_document,
+    detect_file_type=_dummy_detect_file_type,
+    extract_text=_unavailable("OCRService"),  # Ancienne méthode (pour compatibilité)
+)
+
+_FORM_PARSER_DUMMY = types.SimpleNamespace(
+    available=False,
+    config=DEFAULT_NLP_CONFIG,
+    extract_form_fields=_unavailable("FormParserService"),
+    parse_form_fields=_dummy_parse_form_fields,
+    detect_form_type=_dummy_detect_form_type,
+    calculate_form_completeness=_dummy_calculate_form_completeness,
+    detect_handwriting=_dummy_detect_handwriting,
+)
+
+_LANGUAGE_DETECTOR_DUMMY = types.SimpleNamespace(
+    available=False,
+    config=DEFAULT_NLP_CONFIG,
+    detect=_dummy_detect,
+    detect_with_confidence=_dummy_detect_with_confidence,
+    detect_multiple=_dummy_detect_multiple,
+    detect_language=_dummy_detect,
+)
 
-# ⭐ CORRECTION : Exporter l'instance avec le nom attendu
-ocr_service = ocr_service_instance
+_ORDER_BUILDER_DUMMY = types.SimpleNamespace(
+    available=False,
+    config=DEFAULT_NLP_CONFIG,
+    build_order_from_text=_unavailable("OrderBuilderService"),
+    build_order_structure=_dummy_build_order_structure,
+    prepare_for_order_service=_dummy_prepare_for_order_service,
+)
+
+_NLP_SERVICE_DUMMY = types.SimpleNamespace(
+    available=False,
+    config=DEFAULT_NLP_CONFIG,
+    extract_entities=_dummy_extract_entities,
+    extract_all=_dummy_extract_all,
+    analyze_sentiment=_dummy_analyze_sentiment,
+)
+
+def _dummy_class(sentinel):
+    """'Classe' de secours : tout appel renvoie la sentinelle partagée"""
+    def _factory(*args, **kwargs):
+        return sentinel
+    return _factory
 
 # ==============================================
-# AUTRES SERVICES OCR (optionnels)
+# CHARGEMENT PARESSEUX DES SERVICES (PEP 562)
 # ==============================================
-FormParserServiceClass = None
-try:
-    from .form_parser import FormParserService as FormParserServiceClass
-    FORM_PARSER_AVAILABLE = True
-    # Créer une instance
-    form_parser_instance = FormParserServiceClass(config=DEFAULT_NLP_CONFIG)
-    logger.info("✅ FormParserService disponible")
-except ImportError as e:
-    FORM_PARSER_AVAILABLE = False
-    logger.warning(f"⚠️ FormParserService non disponible: {e}")
-    class FormParserServiceDummy:
-        def __init__(self, config=None):
-            self.available = False
-            self.config = config or {}
-        
-        def extract_form_fields(self, *args, **kwargs):
-            raise ImportError("FormParserService non disponible.")
-        
-        def parse_form_fields(self, text, language):
-            return {}
-        
-        def detect_form_type(self, text, language):
-            return "unknown"
-        
-        def calculate_form_completeness(self, fields, form_type):
-            return 0
-        
-        def detect_handwriting(self, image_path):
-            return False
-        
-        def __call__(self, *args, **kwargs):
-            raise ImportError("FormParserService non disponible.")
-    
-    FormParserServiceClass = FormParserServiceDummy
-    form_parser_instance = FormParserServiceDummy(config=DEFAULT_NLP_CONFIG)
+# Les modules OCR/NLP tirent des dépendances lourdes (paddleocr, cv2,
+# langdetect...) : ils ne sont importés et instanciés qu'au premier accès
+# à l'attribut correspondant (ex: `from app.services import nlp_service`).
+
+# Registre des services : (instance exportée, classe, sentinelle, config).
+# Le module est app.services.<instance>, l'alias de classe <classe>Class et
+# le drapeau de disponibilité <INSTANCE>_AVAILABLE.
+_SERVICES = (
+    ("ocr_service", "OCRService", _OCR_SERVICE_DUMMY, OCR_CONFIG),
+    ("form_parser", "FormParserService", _FORM_PARSER_DUMMY, DEFAULT_NLP_CONFIG),
+    ("language_detector", "LanguageDetectorService", _LANGUAGE_DETECTOR_DUMMY, DEFAULT_NLP_CONFIG),
+    ("order_builder", "OrderBuilderService", _ORDER_BUILDER_DUMMY, DEFAULT_NLP_CONFIG),
+    ("nlp_service", "NLPService", _NLP_SERVICE_DUMMY, DEFAULT_NLP_CONFIG),
+)
+
+# instance exportée -> (module, classe, alias de classe, drapeau, sentinelle, config)
+_LAZY = {
+    attr: (f".{attr}", class_name, f"{class_name}Class", f"{attr.upper()}_AVAILABLE", sentinel, config)
+    for attr, class_name, sentinel, config in _SERVICES
+}
+
+# Services Facebook : une seule instance par processus, créée au premier appel
+@lru_cache(maxsize=None)
+def get_facebook_auth_service() -> FacebookAuthService:
+    return FacebookAuthService()
+
+@lru_cache(maxsize=None)
+def get_facebook_webhook_service() -> FacebookWebhookService:
+    return FacebookWebhookService()
 
-# Exporter l'instance
-form_parser = form_parser_instance
+@lru_cache(maxsize=None)
+def get_facebook_graph_service() -> FacebookGraphAPIService:
+    return FacebookGraphAPIService()
+
+# instance exportée -> fabrique
+_LAZY_FACEBOOK = {
+    "facebook_auth_service": get_facebook_auth_service,
+    "facebook_webhook_service": get_facebook_webhook_service,
+    "facebook_graph_service": get_facebook_graph_service,
+}
 
-LanguageDetectorServiceClass = None
-try:
-    from .language_detector import LanguageDetectorService as LanguageDetectorServiceClass
-    LANGUAGE_DETECTOR_AVAILABLE = True
-    # Créer une instance
+# alias de classe / drapeau -> instance exportée
+_LAZY_ALIASES = {}
+for _name, _entry in _LAZY.items():
+    _LAZY_ALIASES[_entry[2]] = _name
+    _LAZY_ALIASES[_entry[3]] = _name
+
+# instance exportée -> "classe" de secours (renvoie toujours la sentinelle)
+_DUMMY_CLASSES = {_name: _dummy_class(_entry[4]) for _name, _entry in _LAZY.items()}
+
+def _load_class(name: str):
+    """Importe la classe d'un service OCR/NLP (ou sa classe de secours) sans l'instancier"""
+    module_name, class_name, class_alias, flag, _, _ = _LAZY[name]
     try:
-        language_detector_instance = LanguageDetectorServiceClass(config=DEFAULT_NLP_CONFIG)
-    except TypeError:
-        # Si la classe n'accepte pas config
-        language_detector_instance = LanguageDetectorServiceClass()
-    logger.info("✅ LanguageDetectorService disponible")
-except ImportError as e:
-    LANGUAGE_DETECTOR_AVAILABLE = False
-    logger.warning(f"⚠️ LanguageDetectorService non disponible: {e}")
-    class LanguageDetectorServiceDummy:
-        def __init__(self, config=None):
-            self.available = False
-            self.config = config or {}
-        
-        def detect(self, text):
-            return "fr"  # Français par défaut
-        
-        def detect_with_confidence(self, text):
-            return ("fr", 1.0)  # Pour compatibilité
-        
-        def detect_multiple(self, texts):
-            return ["fr"] * len(texts) if texts else []
-        
-        def detect_language(self, text):
-            return "fr"
+        service_class = getattr(importlib.import_module(module_name, __name__), class_name)
+        available = True
+    except Exception as e:
+        logger.warning(f"⚠️ {class_name} non disponible: {e}")
+        service_class = _DUMMY_CLASSES[name]
+        available = False
     
-    LanguageDetectorServiceClass = LanguageDetectorServiceDummy
-    language_detector_instance = LanguageDetectorServiceDummy(config=DEFAULT_NLP_CONFIG)
-
-# Exporter l'instance
-language_detector = language_detector_instance
+    globals().update({class_alias: service_class, flag: available})
+    return service_class
 
-OrderBuilderServiceClass = None
-try:
-    from .order_builder import OrderBuilderService as OrderBuilderServiceClass
-    ORDER_BUILDER_AVAILABLE = True
-    # Créer une instance
+def _load_service(name: str):
+    """Instancie un service OCR/NLP, ou renvoie sa sentinelle de secours"""
+    _, class_name, class_alias, flag, sentinel, config = _LAZY[name]
+    service_class = globals()[class_alias] if class_alias in globals() else _load_class(name)
+    if service_class is _DUMMY_CLASSES[name]:
+        globals()[name] = sentinel
+        return sentinel
     try:
-        order_builder_instance = OrderBuilderServiceClass(config=DEFAULT_NLP_CONFIG)
-    except TypeError:
-        order_builder_instance = OrderBuilderServiceClass()
-    logger.info("✅ OrderBuilderService disponible")
-except ImportError as e:
-    ORDER_BUILDER_AVAILABLE = False
-    logger.warning(f"⚠️ OrderBuilderService non disponible: {e}")
-    class OrderBuilderServiceDummy:
-        def __init__(self, config=None):
-            self.available = False
-            self.config = config or {}
-        
-        def build_order_from_text(self, *args, **kwargs):
-            raise ImportError("OrderBuilderService non disponible.")
-        
-        def build_order_structure(self, nlp_data, form_fields=None):
-            return {}
-        
-        def prepare_for_order_service(self, order_structure):
-            return {}
+        try:
+            instance = service_class(config=config)
+        except TypeError:
+            # Si la classe n'accepte pas config
+            instance = service_class()
+        # Niveau DEBUG : pas de ligne par service et par worker à chaque démarrage
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"✅ {class_name} disponible et initialisé")
+    except Exception as e:
+        logger.warning(f"⚠️ {class_name} non initialisé: {e}")
+        instance = sentinel
+        globals().update({class_alias: _DUMMY_CLASSES[name], flag: False})
     
-    OrderBuilderServiceClass = OrderBuilderServiceDummy
-    order_builder_instance = OrderBuilderServiceDummy(config=DEFAULT_NLP_CONFIG)
+    globals()[name] = instance
+    return instance
 
-# Exporter l'instance
-order_builder = order_builder_instance
+def __getattr__(name: str):
+    if name in _LAZY:
+        return _load_service(name)
+    if name in _LAZY_ALIASES:
+        # Classe ou drapeau seul : pas besoin d'instancier le service
+        _load_class(_LAZY_ALIASES[name])
+        return globals()[name]
+    if name in _LAZY_FACEBOOK:
+        instance = _LAZY_FACEBOOK[name]()
+        globals()[name] = instance
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# ==============================================
-# SERVICES FACEBOOK
-# ==============================================
-facebook_auth_service = FacebookAuthService()
-facebook_webhook_service = FacebookWebhookService()
-facebook_graph_service = FacebookGraphAPIService()
+class _ServicesModule(types.ModuleType):
+    """
+    Les sous-modules portent le même nom que les instances exportées
+    (ex: app.services.nlp_service) : leur import ne doit pas écraser
+    l'attribut du package par l'objet module.
+    """
+    def __setattr__(self, name, value):
+        if name in _LAZY and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
 
-# ==============================================
-# SERVICE NLP
-# ==============================================
-NLPServiceClass = None
-try:
-    from .nlp_service import NLPService as NLPServiceClass
-    nlp_service_instance = NLPServiceClass(config=DEFAULT_NLP_CONFIG)
-    logger.info("✅ Service NLP initialisé avec succès")
-except Exception as e:
-    logger.error(f"❌ Erreur initialisation NLP Service: {e}")
-    class NLPServiceDummy:
-        def __init__(self, config=None):
-            self.available = False
-            self.config = config or {}
-        
-        def extract_entities(self, *args, **kwargs):
-            return []
-        
-        def extract_all(self, text, language="fr"):
-            return {
-                "text": text,
-                "language": language,
-                "intent": "OTHER",
-                "intent_confidence": 0.0,
-                "phone_numbers": [],
-                "emails": [],
-                "first_name": "",
-                "last_name": "",
-                "address": {},
-                "order_items": [],
-                "prices": [],
-                "processing_time": 0.0
-            }
-        
-        def analyze_sentiment(self, *args, **kwargs):
-            return "neutral"
-    
-    NLPServiceClass = NLPServiceDummy
-    nlp_service_instance = NLPServiceDummy(config=DEFAULT_NLP_CONFIG)
-    logger.warning("⚠️ NLP Service factice créé")
+sys.modules[__name__].__class__ = _ServicesModule
 
-# Exporter l'instance
-nlp_service = nlp_service_instance
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 # ==============================================
 # EXPORT FINAL - CORRIGÉ
 # ==============================================
-__all__ = [
+__all__ = (
     # Services Facebook
     'FacebookAuthService',
-    'FacebookWebhookService', 
+    'FacebookWebhookService',
     'FacebookGraphAPIService',
     
     # Services OCR/NLP - INSTANCES
     'ocr_service',           # ⭐ Instance du service OCR
-    'form_parser',           # ⭐ Instance du form parser  
+    'form_parser',           # ⭐ Instance du form parser
     'language_detector',     # ⭐ Instance du détecteur de langue
     'order_builder',         # ⭐ Instance du constructeur de commandes
     'nlp_service',           # ⭐ Instance du service NLP
@@ -279,25 +308,25 @@ __all__ = [
     'facebook_auth_service',
     'facebook_webhook_service',
     'facebook_graph_service',
+    'get_facebook_auth_service',
+    'get_facebook_webhook_service',
+    'get_facebook_graph_service',
     
     # Autres services
-    'EmailService', 
+    'EmailService',
     'email_service',
     'geocoding_service',
     
-    # ⭐ CORRECTION : N'exporte les classes que si elles existent
-    'OCRServiceClass' if OCRServiceClass else None,
-    'FormParserServiceClass' if FormParserServiceClass else None,
-    'LanguageDetectorServiceClass' if LanguageDetectorServiceClass else None,
-    'OrderBuilderServiceClass' if OrderBuilderServiceClass else None,
-    'NLPServiceClass' if NLPServiceClass else None,
+    # Classes (réelles ou de secours, résolues au premier accès)
+    'OCRServiceClass',
+    'FormParserServiceClass',
+    'LanguageDetectorServiceClass',
+    'OrderBuilderServiceClass',
+    'NLPServiceClass',
     
-    # ⭐ ALTERNATIVE : Export conditionnel (plus propre)
+    # Disponibilité des services
     'OCR_SERVICE_AVAILABLE',
     'FORM_PARSER_AVAILABLE',
     'LANGUAGE_DETECTOR_AVAILABLE',
-    'ORDER_BUILDER_AVAILABLE'
-]
-
-# ⭐ NETTOYAGE : Supprimer les None de la liste d'export
-__all__ = [item for item in __all__ if item is not None]
\ No newline at end of file
+    'ORDER_BUILDER_AVAILABLE',
+)
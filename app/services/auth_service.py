@@ -1,15 +1,58 @@
-from datetime import datetime
-from sqlite3 import IntegrityError
+from typing import TYPE_CHECKING
+import os
+import threading
 import uuid
-from requests import Session
 
-from app.core.security import hash_password
+from sqlalchemy.exc import IntegrityError
+
+from app.core.security import get_password_hash as hash_password
 from app.models.seller import Seller
 from app.models.user import User
 
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+# Valeurs de rôle désignant un vendeur (comparées après casefold)
+_VENDEUR_ALIASES = frozenset({"vendeur", "seller"})
+
+# Noms possibles de la contrainte d'unicité sur users.email
+_EMAIL_UNIQUE_CONSTRAINTS = frozenset({"users_email_key", "ix_users_email"})
+
+# Réserve d'aléa pour les UUID : un seul appel à os.urandom pour 64 UUID
+_UUID_POOL_SIZE = 1024
+_uuid_pool = bytearray()
+_uuid_pool_lock = threading.Lock()
+# Un processus enfant ne doit jamais réutiliser l'aléa de son parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_uuid_pool.clear)
+
+
+def _fast_uuid() -> uuid.UUID:
+    """UUID version 4 (RFC 4122) tiré d'une réserve d'octets aléatoires"""
+    with _uuid_pool_lock:
+        if not _uuid_pool:
+            _uuid_pool.extend(os.urandom(_UUID_POOL_SIZE))
+        raw = _uuid_pool[-16:]
+        del _uuid_pool[-16:]
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # variante RFC 4122
+    return uuid.UUID(bytes=bytes(raw))
+
+
+def _is_duplicate_email(error: Exception) -> bool:
+    """Indique si l'erreur d'intégrité provient de la contrainte UNIQUE sur users.email"""
+    orig = getattr(error, "orig", error)
+    diag = getattr(orig, "diag", None)
+    constraint = getattr(diag, "constraint_name", None)
+    if constraint:
+        return constraint in _EMAIL_UNIQUE_CONSTRAINTS
+    # Pilotes sans diagnostic structuré (ex: SQLite : "UNIQUE constraint failed: users.email")
+    message = str(orig)
+    return "users.email" in message or any(name in message for name in _EMAIL_UNIQUE_CONSTRAINTS)
+
 
 def create_user(
-    db: Session, 
+    db: "Session", 
     nom_complet: str, 
     email: str, 
     password: str, 
@@ -18,19 +61,19 @@ def create_user(
     company_name: str = None,
     adresse: str = None
 ):
+    # Hachage bcrypt (volontairement lent) fait avant tout accès à la base :
+    # la connexion n'est pas retenue pendant le calcul
+    password_hash = hash_password(password)
+
     try:
-        # Vérifier si l'email existe déjà
-        existing_user = db.query(User).filter(User.email == email).first()
-        if existing_user:
-            raise ValueError("Un utilisateur avec cet email existe déjà")
+        # Pas de SELECT préalable : l'unicité de l'email est garantie par la
+        # contrainte UNIQUE de users.email (cf. except IntegrityError)
 
-        # Générer un UUID pour l'utilisateur
-        user_id = uuid.uuid4()  # ✅ CORRECTION : Retirer str()
-        password_hash = hash_password(password)
-        now = datetime.now()
+        # Générer les UUID côté client (clé étrangère du Seller connue d'avance)
+        user_id = _fast_uuid()  # ✅ CORRECTION : Retirer str()
         
         # ✅ CORRECTION : Utiliser "Vendeur" avec V majuscule
-        user_role = "Vendeur" if role.lower() in ["vendeur", "seller"] else role
+        user_role = "Vendeur" if role.casefold() in _VENDEUR_ALIASES else role
         
         # Créer l'utilisateur
         user = User(
@@ -40,35 +83,34 @@ def create_user(
             telephone=telephone,
             role=user_role,  # ✅ CORRIGÉ : "Vendeur" avec V majuscule
             adresse=adresse,
-            password_hash=password_hash,
-            created_at=now,
-            updated_at=now
+            password=password_hash
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
 
         # ✅ CORRECTION : Vérifier avec le rôle corrigé
         if user_role == "Vendeur":
             # Validation du company_name pour les vendeurs
             if not company_name or company_name.strip() == "":
-                company_name = f"Boutique de {nom_complet.split()[0]}"  # Premier nom
+                company_name = f"Boutique de {nom_complet.lstrip().partition(' ')[0]}"  # Premier nom
             
             seller = Seller(
-                id=uuid.uuid4(),  # ✅ CORRECTION : Nouvel UUID pour Seller
+                id=_fast_uuid(),  # ✅ CORRECTION : Nouvel UUID pour Seller
                 user_id=user_id,  # ✅ CORRECTION : Référence à l'user
-                company_name=company_name.strip(),
-                created_at=now,
-                updated_at=now
+                company_name=company_name.strip()
             )
             db.add(seller)
-            db.commit()
-            db.refresh(seller)
+
+        # Une seule transaction : User et Seller sont créés ensemble ou pas du tout.
+        # Pas de refresh() : l'objet expiré par le commit est rechargé au premier
+        # accès (created_at/updated_at : now() calculé par PostgreSQL)
+        db.commit()
 
         return user
 
     except IntegrityError as e:
         db.rollback()
+        if _is_duplicate_email(e):
+            raise ValueError("Un utilisateur avec cet email existe déjà")
         raise ValueError(f"Erreur d'intégrité de la base de données: {str(e)}")
     except Exception as e:
         db.rollback()
@@ -1,26 +1,254 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import (
+    BigInteger, String, and_, or_, case, cast, exists, func, literal, select, tuple_, update
+)
 from uuid import UUID
-from typing import List, Optional, Dict, Any, Tuple
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+import asyncio
 import logging
+from collections import OrderedDict
 from datetime import datetime
 
+from app.db import AsyncSessionLocal
 from app.services.geocoding_service import geocoding_service
 from app.models import User, Driver
-from app.schemas import (
+from app.schemas.schemas import (
     DriverCreateSimple,  # Pour create_driver
     UserUpdate,         # Pour update_driver
-    DriverUpdate        # Pour update_driver
+    DriverUpdate,       # Pour update_driver
+    DriverListItem      # Pour les listes (colonnes seules)
 )
 from app.core.security import get_password_hash
 
 logger = logging.getLogger(__name__)
 
+# Rôles acceptés pour le vendeur (comparés en majuscules)
+_VALID_SELLER_ROLES = frozenset({"VENDEUR", "VENDOR"})
+
+# action -> (statut utilisateur, actif/disponible, message)
+_STATUS_ACTIONS = {
+    "activate": ("actif", True, "Livreur activé avec succès"),
+    "suspend": ("suspendu", False, "Livreur suspendu avec succès"),
+    "delete": ("suspendu", False, "Livreur supprimé avec succès"),  # Soft delete
+}
+
+# Cache LRU adresse normalisée -> zone, consulté avant le géocodeur.
+# Accédé uniquement depuis la boucle d'événements (aucun await entre lecture
+# et écriture), donc sans verrou.
+_ZONE_CACHE_MAX = 10_000
+_zone_cache: "OrderedDict[str, str]" = OrderedDict()
+
+def _zone_key(address: str) -> str:
+    """Clé de cache : adresse en minuscules, espaces normalisés"""
+    return " ".join(address.lower().split())
+
+def _remember_zone(key: str, zone: str) -> None:
+    _zone_cache[key] = zone
+    _zone_cache.move_to_end(key)
+    if len(_zone_cache) > _ZONE_CACHE_MAX:
+        _zone_cache.popitem(last=False)
+
+async def _extract_zone(address: str) -> str:
+    """Géocodage (synchrone, requêtes HTTP) exécuté hors de la boucle d'événements"""
+    key = _zone_key(address)
+    zone = _zone_cache.get(key)
+    if zone is not None:
+        _zone_cache.move_to_end(key)
+        return zone
+    
+    zone = await asyncio.to_thread(geocoding_service.extract_zone_from_address, address)
+    _remember_zone(key, zone)
+    return zone
+
+# Géocodage différé : create_driver insère le livreur sans zone et confie
+# l'adresse à un worker qui géocode par lots puis met à jour en un UPDATE.
+_GEOCODE_BATCH_SIZE = 50
+_GEOCODE_BATCH_WINDOW = 0.5  # secondes
+_geocode_queue: Optional["asyncio.Queue[Tuple[UUID, str]]"] = None
+_geocode_worker: Optional[asyncio.Task] = None
+
+def _fallback_zone(address: str) -> str:
+    """Zone de secours : début de l'adresse"""
+    return address[:50]
+
+def _enqueue_geocoding(driver_id: UUID, address: str) -> None:
+    """Ajoute un livreur à géocoder (démarre le worker si nécessaire)"""
+    global _geocode_queue, _geocode_worker
+    if (_geocode_worker is None or _geocode_worker.done()
+            or _geocode_worker.get_loop() is not asyncio.get_running_loop()):
+        _geocode_queue = asyncio.Queue()
+        _geocode_worker = asyncio.create_task(_geocode_worker_loop(_geocode_queue))
+    _geocode_queue.put_nowait((driver_id, address))
+
+# Marqueur d'arrêt du worker (close_geocode_worker)
+_STOP_GEOCODING = object()
+
+async def _next_geocode_batch(queue: "asyncio.Queue[Tuple[UUID, str]]") -> Tuple[List[Tuple[UUID, str]], bool]:
+    """
+    Attend une adresse puis regroupe les suivantes (taille ou fenêtre max) ;
+    le booléen indique qu'un arrêt a été demandé
+    """
+    loop = asyncio.get_running_loop()
+    item = await queue.get()
+    if item is _STOP_GEOCODING:
+        return [], True
+    batch = [item]
+    deadline = loop.time() + _GEOCODE_BATCH_WINDOW
+    while len(batch) < _GEOCODE_BATCH_SIZE:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            item = await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            break
+        if item is _STOP_GEOCODING:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+async def _geocode_batch(batch: List[Tuple[UUID, str]]) -> None:
+    """Géocode un lot de livreurs et enregistre leurs zones en un UPDATE"""
+    try:
+        zones = {}
+        misses = []
+        for driver_id, address in batch:
+            key = _zone_key(address)
+            if key in _zone_cache:
+                zones[driver_id] = _zone_cache[key]
+            else:
+                misses.append((driver_id, address, key))
+        
+        if misses:
+            try:
+                found = await asyncio.to_thread(
+                    geocoding_service.batch_extract, [address for _, address, _ in misses]
+                )
+            except Exception as e:
+                logger.error(f"Erreur géocodage par lot: {e}")
+                found = [None] * len(misses)
+            for (driver_id, address, key), zone in zip(misses, found):
+                if zone:
+                    _remember_zone(key, zone)
+                zones[driver_id] = zone or _fallback_zone(address)
+        
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Driver)
+                .where(Driver.id.in_(list(zones)))
+                .values(zone_livraison=case(zones, value=Driver.id))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        logger.info(f"Zones géocodées pour {len(zones)} livreur(s)")
+    except Exception as e:
+        logger.error(f"Erreur mise à jour des zones géocodées: {e}")
+
+async def _geocode_worker_loop(queue: "asyncio.Queue[Tuple[UUID, str]]") -> None:
+    """Géocode les livreurs par lots jusqu'à la demande d'arrêt"""
+    stopping = False
+    while not stopping:
+        batch, stopping = await _next_geocode_batch(queue)
+        if batch:
+            await _geocode_batch(batch)
+
+async def close_geocode_worker() -> None:
+    """
+    À appeler à l'arrêt de l'application : géocode les livreurs encore en
+    file (lot en cours compris) puis arrête le worker
+    """
+    global _geocode_queue, _geocode_worker
+    worker, queue = _geocode_worker, _geocode_queue
+    if worker is None:
+        return
+    if not worker.done() and worker.get_loop() is asyncio.get_running_loop():
+        queue.put_nowait(_STOP_GEOCODING)
+        await worker
+    
+    # Adresses arrivées après la demande d'arrêt
+    remaining = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is not _STOP_GEOCODING:
+            remaining.append(item)
+    for start in range(0, len(remaining), _GEOCODE_BATCH_SIZE):
+        await _geocode_batch(remaining[start:start + _GEOCODE_BATCH_SIZE])
+    
+    _geocode_worker = None
+    _geocode_queue = None
+
+# Curseur de pagination (keyset) : (created_at, id) du dernier livreur de la page
+DriverCursor = Tuple[datetime, UUID]
+
+def _paginate(stmt, skip: int, limit: int, cursor: Optional[DriverCursor]):
+    """Tri (created_at, id) décroissant ; WHERE sur le curseur si fourni, sinon OFFSET"""
+    stmt = stmt.order_by(Driver.created_at.desc(), Driver.id.desc())
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Driver.created_at, Driver.id) < tuple_(*cursor))
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+def _search_clause(search_term: str):
+    """Recherche par nom, email, téléphone ou zone"""
+    pattern = f"%{search_term}%"
+    return or_(
+        User.full_name.ilike(pattern),
+        User.email.ilike(pattern),
+        User.telephone.ilike(pattern),
+        Driver.zone_livraison.ilike(pattern)
+    )
+
+# Colonnes de DriverListItem : pas de mot de passe ni de dates inutiles à la liste
+_DRIVER_LIST_COLUMNS = (
+    Driver.id, Driver.user_id, Driver.seller_id,
+    User.full_name, User.email, User.telephone, User.adresse, User.role, User.statut,
+    Driver.zone_livraison, Driver.disponibilite, User.is_active, Driver.created_at,
+)
+
+# Taille des lots lus depuis le curseur serveur (stream_seller_driver_items)
+_STREAM_BATCH = 200
+
+def _seller_items_stmt(
+    seller_id: UUID,
+    statut: Optional[str],
+    disponibilite: Optional[bool],
+    zone: Optional[str]
+):
+    """Requête DriverListItem des livreurs d'un vendeur, filtres appliqués"""
+    stmt = select(*_DRIVER_LIST_COLUMNS)\
+        .join(User, User.id == Driver.user_id)\
+        .where(Driver.seller_id == seller_id)
+    
+    if disponibilite is not None:
+        stmt = stmt.where(Driver.disponibilite == disponibilite)
+    if zone:
+        stmt = stmt.where(Driver.zone_livraison.ilike(f"%{zone}%"))
+    if statut:
+        stmt = stmt.where(User.statut == statut)
+    return stmt
+
+async def _list_items(db: AsyncSession, stmt) -> List[DriverListItem]:
+    """Exécute une requête sur _DRIVER_LIST_COLUMNS et construit les DTO"""
+    rows = (await db.execute(stmt)).all()
+    # Données issues de la base, déjà typées : pas de revalidation Pydantic
+    return [DriverListItem.model_construct(**row._mapping) for row in rows]
+
 class DriverService:
     
+    @staticmethod
+    def next_cursor(drivers: List[Driver], limit: int) -> Optional[DriverCursor]:
+        """Curseur de la page suivante (None si c'était la dernière page)"""
+        if len(drivers) < limit:
+            return None
+        last = drivers[-1]
+        return last.created_at, last.id
+    
     @staticmethod
     async def create_driver(
-        db: Session, 
+        db: AsyncSession, 
         driver_data: DriverCreateSimple,
         seller_id: UUID,
         current_user_id: UUID
@@ -32,25 +260,25 @@ class DriverService:
             # Convertir en dict
             data_dict = driver_data.dict()
             
-            # Vérifier si l'email existe déjà
-            existing_user = db.query(User).filter(
-                User.email == data_dict["email"]
-            ).first()
+            # Email déjà utilisé (EXISTS) + rôle du vendeur : une seule requête,
+            # sans charger de ligne User complète
+            email_taken, seller_role = (await db.execute(
+                select(
+                    exists().where(User.email == data_dict["email"]),
+                    select(User.role).where(User.id == seller_id).scalar_subquery()
+                )
+            )).one()
             
-            if existing_user:
+            if email_taken:
                 return None, None, "Email déjà utilisé"
             
             # Vérifier que le vendeur existe
-            seller_user = db.query(User).filter(
-                User.id == seller_id
-            ).first()
-            
-            if not seller_user:
+            if seller_role is None:
                 return None, None, "Vendeur non trouvé"
             
             # Vérifier que le vendeur a le bon rôle
-            if seller_user.role.upper() not in ["VENDEUR", "VENDOR", "Vendeur"]:
-                return None, None, f"L'utilisateur n'est pas un vendeur. Rôle: {seller_user.role}"
+            if seller_role.upper() not in _VALID_SELLER_ROLES:
+                return None, None, f"L'utilisateur n'est pas un vendeur. Rôle: {seller_role}"
             
             # Créer l'utilisateur (LIVREUR)
             hashed_password = get_password_hash(data_dict["password"])
@@ -67,20 +295,10 @@ class DriverService:
             )
             
             db.add(user)
-            db.flush()
+            await db.flush()
             
-            # Déterminer la zone de livraison
-            zone_livraison = data_dict.get("zone_livraison")
-            if not zone_livraison or zone_livraison == "":
-                try:
-                    zone_livraison = geocoding_service.extract_zone_from_address(
-                        data_dict["adresse"]
-                    )
-                    logger.info(f"Zone géocodée: {zone_livraison}")
-                except Exception as e:
-                    logger.error(f"Erreur géocodage: {e}")
-                    # Fallback: utiliser le début de l'adresse
-                    zone_livraison = data_dict["adresse"][:50] if len(data_dict["adresse"]) > 50 else data_dict["adresse"]
+            # Zone de livraison : fournie, déjà en cache, sinon géocodée après le commit (worker)
+            zone_livraison = data_dict.get("zone_livraison") or _zone_cache.get(_zone_key(data_dict["adresse"]))
             
             # Créer le driver
             driver = Driver(
@@ -91,19 +309,22 @@ class DriverService:
             )
             
             db.add(driver)
-            db.commit()
+            await db.commit()
+            
+            if zone_livraison is None:
+                _enqueue_geocoding(driver.id, data_dict["adresse"])
             
             logger.info(f"Livreur créé: {user.email} pour le vendeur {seller_id}")
             return user, driver, "Livreur créé avec succès"
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur création livreur: {e}")
             return None, None, f"Erreur création: {str(e)}"
     
     @staticmethod
     async def update_driver(
-        db: Session,
+        db: AsyncSession,
         driver_id: UUID,
         user_data: Optional[UserUpdate],
         driver_data: Optional[DriverUpdate],
@@ -112,65 +333,87 @@ class DriverService:
         """
         Met à jour les informations d'un livreur
         """
+        # Champs fournis uniquement (None = non modifié)
+        user_changes = user_data.dict(exclude_unset=True, exclude_none=True) if user_data else {}
+        driver_changes = driver_data.dict(exclude_unset=True, exclude_none=True) if driver_data else {}
+        
         try:
-            # Récupérer le driver avec vérification du seller_id
-            driver = db.query(Driver).filter(
-                and_(
-                    Driver.id == driver_id,
-                    Driver.seller_id == seller_id
+            # Récupérer le driver (vérification du seller_id) avec son utilisateur,
+            # chargé par la même jointure : pas de second SELECT sur users
+            driver = await db.scalar(
+                select(Driver)
+                .join(Driver.user)
+                .where(
+                    and_(
+                        Driver.id == driver_id,
+                        Driver.seller_id == seller_id
+                    )
                 )
-            ).first()
+                .options(contains_eager(Driver.user))
+            )
             
             if not driver:
                 return None, "Livreur non trouvé"
+            user = driver.user
+            
+            # Ne garder que les valeurs réellement différentes (formulaire renvoyé tel quel)
+            user_values = {k: v for k, v in user_changes.items() if getattr(user, k) != v}
+            driver_changes = {k: v for k, v in driver_changes.items() if getattr(driver, k) != v}
+            if not user_values and not driver_changes:
+                # Rien à écrire : ni transaction d'écriture ni commit
+                return driver, "Aucune modification"
             
-            # Mettre à jour l'utilisateur si des données sont fournies
-            if user_data:
-                user = db.query(User).filter(User.id == driver.user_id).first()
-                if not user:
-                    return None, "Utilisateur non trouvé"
-                
-                # Mettre à jour les champs fournis
-                update_dict = user_data.dict(exclude_unset=True)
-                for field, value in update_dict.items():
-                    if value is not None:
-                        if field == "adresse":
-                            old_address = user.adresse
-                            setattr(user, field, value)
-                            # Mettre à jour la zone de livraison si l'adresse change
-                            if value != old_address:
-                                try:
-                                    driver.zone_livraison = geocoding_service.extract_zone_from_address(value)
-                                    logger.info(f"Zone mise à jour pour nouvelle adresse: {driver.zone_livraison}")
-                                except Exception as e:
-                                    logger.error(f"Erreur géocodage lors de la mise à jour: {e}")
-                        else:
-                            setattr(user, field, value)
-            
-            # Mettre à jour le driver si des données sont fournies
-            if driver_data:
-                update_dict = driver_data.dict(exclude_unset=True)
-                for field, value in update_dict.items():
-                    if value is not None:
-                        setattr(driver, field, value)
-            
-            # Mettre à jour la date de modification
-            driver.updated_at = datetime.utcnow()
-            
-            db.commit()
-            db.refresh(driver)
+            driver_values = {}
+            
+            # Mettre à jour la zone de livraison si l'adresse change
+            new_address = user_values.get("adresse")
+            if new_address is not None:
+                try:
+                    driver_values["zone_livraison"] = await _extract_zone(new_address)
+                    logger.info(f"Zone mise à jour pour nouvelle adresse: {driver_values['zone_livraison']}")
+                except Exception as e:
+                    logger.error(f"Erreur géocodage lors de la mise à jour: {e}")
+            
+            # Les données livreur explicites priment sur la zone géocodée
+            driver_values.update(driver_changes)
+            
+            # UPDATE direct, limité aux colonnes fournies
+            if user_values:
+                user_updated_at = await db.scalar(
+                    update(User)
+                    .where(User.id == driver.user_id)
+                    .values(**user_values)
+                    .returning(User.updated_at)
+                    .execution_options(synchronize_session=False)
+                )
+                for field, value in {**user_values, "updated_at": user_updated_at}.items():
+                    set_committed_value(user, field, value)
+            
+            if driver_values:
+                updated_at = await db.scalar(
+                    update(Driver)
+                    .where(Driver.id == driver.id)
+                    .values(**driver_values)
+                    .returning(Driver.updated_at)
+                    .execution_options(synchronize_session=False)
+                )
+                # Reporter les nouvelles valeurs sur l'objet chargé, sans SELECT
+                for field, value in {**driver_values, "updated_at": updated_at}.items():
+                    set_committed_value(driver, field, value)
+            
+            await db.commit()
             
             logger.info(f"Livreur mis à jour: {driver.id}")
             return driver, "Livreur mis à jour avec succès"
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur mise à jour livreur: {e}")
             return None, f"Erreur mise à jour: {str(e)}"
     
     @staticmethod
     async def toggle_driver_status(
-        db: Session,
+        db: AsyncSession,
         driver_id: UUID,
         action: str,  # "activate", "suspend", "delete"
         seller_id: UUID
@@ -178,105 +421,100 @@ class DriverService:
         """
         Active, suspend ou supprime (soft delete) un livreur
         """
+        if action not in _STATUS_ACTIONS:
+            return None, "Action non valide"
+        
         try:
-            # Récupérer le driver avec vérification du seller_id
-            driver = db.query(Driver).filter(
-                and_(
-                    Driver.id == driver_id,
-                    Driver.seller_id == seller_id
+            statut, is_active, message = _STATUS_ACTIONS[action]
+            
+            # 1) Driver du vendeur (le contrôle seller_id fait partie de l'UPDATE)
+            driver_cte = (
+                update(Driver)
+                .where(
+                    and_(
+                        Driver.id == driver_id,
+                        Driver.seller_id == seller_id
+                    )
                 )
-            ).first()
+                .values(disponibilite=is_active)
+                .returning(Driver.user_id)
+                .cte("updated_driver")
+            )
             
-            if not driver:
-                return None, "Livreur non trouvé"
+            # 2) Utilisateur associé, dans la même requête (WITH ... UPDATE ... FROM)
+            user_values = {"statut": statut, "is_active": is_active}
+            if action == "delete":
+                # Soft delete : modifier l'email pour éviter les conflits
+                # (horodatage epoch calculé par PostgreSQL)
+                epoch = cast(func.extract("epoch", func.now()), BigInteger)
+                user_values["email"] = (
+                    literal("deleted_") + cast(epoch, String) + "_" + User.email
+                )
+            
+            user = (await db.scalars(
+                update(User)
+                .where(User.id == driver_cte.c.user_id)
+                .values(**user_values)
+                .returning(User)
+                .execution_options(synchronize_session=False)
+            )).one_or_none()
             
-            user = db.query(User).filter(User.id == driver.user_id).first()
             if not user:
-                return None, "Utilisateur non trouvé"
-            
-            if action == "activate":
-                user.statut = "actif"
-                user.is_active = True
-                driver.disponibilite = True
-                message = "Livreur activé avec succès"
-                
-            elif action == "suspend":
-                user.statut = "suspendu"
-                user.is_active = False
-                driver.disponibilite = False
-                message = "Livreur suspendu avec succès"
-                
-            elif action == "delete":
-                # Soft delete
-                user.statut = "suspendu"
-                user.is_active = False
-                driver.disponibilite = False
-                # Modifier l'email pour éviter les conflits
-                import time
-                timestamp = int(time.time())
-                original_email = user.email
-                user.email = f"deleted_{timestamp}_{original_email}"
-                message = "Livreur supprimé avec succès"
-                logger.info(f"Livreur soft-delete: {original_email} -> {user.email}")
-                
-            else:
-                return None, "Action non valide"
+                await db.rollback()
+                return None, "Livreur non trouvé"
             
-            # Mettre à jour les dates
-            user.updated_at = datetime.utcnow()
-            driver.updated_at = datetime.utcnow()
+            await db.commit()
             
-            db.commit()
-            db.refresh(user)
+            if action == "delete":
+                logger.info(f"Livreur soft-delete: {user.email}")
             
             logger.info(f"Statut livreur changé: {user.email} -> {action}")
             return user, message
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur changement statut livreur: {e}")
             return None, f"Erreur: {str(e)}"
     
     @staticmethod
     async def get_seller_drivers(
-        db: Session,
+        db: AsyncSession,
         seller_id: UUID,
         statut: Optional[str] = None,
         disponibilite: Optional[bool] = None,
         zone: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[DriverCursor] = None
     ) -> List[Driver]:
         """
         Récupère la liste des livreurs d'un vendeur avec filtres
+        (pagination par `cursor` de préférence à `skip`, voir next_cursor)
         """
         try:
             # Construire la requête de base
-            query = db.query(Driver).filter(Driver.seller_id == seller_id)
+            stmt = select(Driver).where(Driver.seller_id == seller_id)
             
             # Filtrer par disponibilité
             if disponibilite is not None:
-                query = query.filter(Driver.disponibilite == disponibilite)
+                stmt = stmt.where(Driver.disponibilite == disponibilite)
             
             # Filtrer par zone
             if zone:
-                query = query.filter(Driver.zone_livraison.ilike(f"%{zone}%"))
-            
-            # Joindre avec User pour les autres filtres
-            query = query.join(User, User.id == Driver.user_id)
+                stmt = stmt.where(Driver.zone_livraison.ilike(f"%{zone}%"))
             
-            # Filtrer par statut
+            # Filtrer par statut : jointure nécessaire, User chargé depuis celle-ci
+            # (joinedload ajouterait une seconde jointure sur users)
             if statut:
-                query = query.filter(User.statut == statut)
-            
-            # Charger les données utilisateur
-            query = query.options(joinedload(Driver.user))
-            
-            # Trier par date de création (plus récent d'abord)
-            query = query.order_by(Driver.created_at.desc())
+                stmt = stmt.join(Driver.user).where(User.statut == statut)
+                stmt = stmt.options(contains_eager(Driver.user))
+            else:
+                # Sans filtre utilisateur : page de drivers seule (index seller_id,
+                # created_at), puis les users de la page en un SELECT ... IN
+                stmt = stmt.options(selectinload(Driver.user))
             
-            # Appliquer pagination
-            drivers = query.offset(skip).limit(limit).all()
+            # Trier par date de création (plus récent d'abord) et paginer
+            drivers = (await db.scalars(_paginate(stmt, skip, limit, cursor))).all()
             
             logger.debug(f"Récupération de {len(drivers)} livreurs pour le vendeur {seller_id}")
             return drivers
@@ -287,7 +525,7 @@ class DriverService:
     
     @staticmethod
     async def get_driver_details(
-        db: Session,
+        db: AsyncSession,
         driver_id: UUID,
         seller_id: UUID
     ) -> Optional[Driver]:
@@ -295,12 +533,14 @@ class DriverService:
         Récupère les détails d'un livreur spécifique
         """
         try:
-            driver = db.query(Driver).filter(
-                and_(
-                    Driver.id == driver_id,
-                    Driver.seller_id == seller_id
-                )
-            ).options(joinedload(Driver.user)).first()
+            driver = await db.scalar(
+                select(Driver).where(
+                    and_(
+                        Driver.id == driver_id,
+                        Driver.seller_id == seller_id
+                    )
+                ).options(joinedload(Driver.user))
+            )
             
             if driver:
                 logger.debug(f"Détails livreur récupérés: {driver_id}")
@@ -315,7 +555,7 @@ class DriverService:
     
     @staticmethod
     async def get_driver_stats(
-        db: Session,
+        db: AsyncSession,
         seller_id: UUID
     ) -> Dict[str, Any]:
         """
@@ -323,52 +563,40 @@ class DriverService:
         """
         try:
             # Compter les livreurs par statut
-            statut_stats = db.query(
-                User.statut,
-                func.count(Driver.id).label("count")
-            ).join(Driver, Driver.user_id == User.id)\
-             .filter(Driver.seller_id == seller_id)\
-             .group_by(User.statut).all()
-            
-            # Compter les livreurs par disponibilité
-            disponibilite_stats = db.query(
-                Driver.disponibilite,
-                func.count(Driver.id).label("count")
-            ).filter(Driver.seller_id == seller_id)\
-             .group_by(Driver.disponibilite).all()
-            
-            # Total des livreurs
-            total_drivers = db.query(func.count(Driver.id))\
-                             .filter(Driver.seller_id == seller_id)\
-                             .scalar() or 0
-            
-            # Livreurs actifs (statut = actif ET is_active = True)
-            active_drivers = db.query(func.count(Driver.id))\
-                              .join(User, User.id == Driver.user_id)\
-                              .filter(
-                                  Driver.seller_id == seller_id,
-                                  User.statut == "actif",
-                                  User.is_active == True
-                              ).scalar() or 0
+            statut_stats = (await db.execute(
+                select(
+                    User.statut,
+                    func.count(Driver.id).label("count")
+                ).join(Driver, Driver.user_id == User.id)
+                 .where(Driver.seller_id == seller_id)
+                 .group_by(User.statut)
+            )).all()
+            
+            # Totaux en une seule requête (agrégats filtrés)
+            totals = (await db.execute(
+                select(
+                    func.count(Driver.id).label("total"),
+                    func.count(Driver.id).filter(
+                        and_(User.statut == "actif", User.is_active == True)
+                    ).label("active"),
+                    func.count(Driver.id).filter(Driver.disponibilite.is_(True)).label("disponible"),
+                    func.count(Driver.id).filter(Driver.disponibilite.isnot(True)).label("indisponible")
+                ).join(User, User.id == Driver.user_id)
+                 .where(Driver.seller_id == seller_id)
+            )).one()
             
             # Formater les résultats
             statut_dict = {statut: count for statut, count in statut_stats}
             disponibilite_dict = {
-                "disponible": 0,
-                "indisponible": 0
+                "disponible": totals.disponible or 0,
+                "indisponible": totals.indisponible or 0
             }
             
-            for disponibilite, count in disponibilite_stats:
-                if disponibilite:
-                    disponibilite_dict["disponible"] = count
-                else:
-                    disponibilite_dict["indisponible"] = count
-            
             logger.debug(f"Statistiques récupérées pour vendeur {seller_id}")
             
             return {
-                "total": total_drivers,
-                "active": active_drivers,
+                "total": totals.total or 0,
+                "active": totals.active or 0,
                 "by_statut": statut_dict,
                 "by_disponibilite": disponibilite_dict
             }
@@ -384,31 +612,27 @@ class DriverService:
     
     @staticmethod
     async def search_drivers(
-        db: Session,
+        db: AsyncSession,
         seller_id: UUID,
         search_term: str,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[DriverCursor] = None
     ) -> List[Driver]:
         """
         Recherche des livreurs par nom, email ou téléphone
+        (pagination par `cursor` de préférence à `skip`, voir next_cursor)
         """
         try:
-            query = db.query(Driver).join(User, User.id == Driver.user_id)\
-                .filter(
+            stmt = select(Driver).join(Driver.user)\
+                .where(
                     and_(
                         Driver.seller_id == seller_id,
-                        or_(
-                            User.full_name.ilike(f"%{search_term}%"),
-                            User.email.ilike(f"%{search_term}%"),
-                            User.telephone.ilike(f"%{search_term}%"),
-                            Driver.zone_livraison.ilike(f"%{search_term}%")
-                        )
+                        _search_clause(search_term)
                     )
-                ).options(joinedload(Driver.user))
+                ).options(contains_eager(Driver.user))
             
-            drivers = query.order_by(Driver.created_at.desc())\
-                          .offset(skip).limit(limit).all()
+            drivers = (await db.scalars(_paginate(stmt, skip, limit, cursor))).all()
             
             logger.debug(f"Recherche '{search_term}': {len(drivers)} résultats")
             return drivers
@@ -417,36 +641,107 @@ class DriverService:
             logger.error(f"Erreur recherche livreurs: {e}")
             return []
     
+    @staticmethod
+    async def get_seller_driver_items(
+        db: AsyncSession,
+        seller_id: UUID,
+        statut: Optional[str] = None,
+        disponibilite: Optional[bool] = None,
+        zone: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[DriverCursor] = None
+    ) -> List[DriverListItem]:
+        """
+        Comme get_seller_drivers, mais ne charge que les colonnes de la liste
+        (DriverListItem) au lieu d'objets ORM Driver + User complets
+        """
+        try:
+            stmt = _seller_items_stmt(seller_id, statut, disponibilite, zone)
+            return await _list_items(db, _paginate(stmt, skip, limit, cursor))
+            
+        except Exception as e:
+            logger.error(f"Erreur récupération liste livreurs: {e}")
+            return []
+    
+    @staticmethod
+    async def stream_seller_driver_items(
+        db: AsyncSession,
+        seller_id: UUID,
+        statut: Optional[str] = None,
+        disponibilite: Optional[bool] = None,
+        zone: Optional[str] = None
+    ) -> AsyncIterator[DriverListItem]:
+        """
+        Parcourt tous les livreurs d'un vendeur via un curseur serveur
+        (lots de _STREAM_BATCH lignes) : mémoire bornée quel que soit le total
+        """
+        stmt = _seller_items_stmt(seller_id, statut, disponibilite, zone)\
+            .order_by(Driver.created_at.desc(), Driver.id.desc())\
+            .execution_options(yield_per=_STREAM_BATCH)
+        
+        result = await db.stream(stmt)
+        async for row in result:
+            yield DriverListItem.model_construct(**row._mapping)
+    
+    @staticmethod
+    async def search_driver_items(
+        db: AsyncSession,
+        seller_id: UUID,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[DriverCursor] = None
+    ) -> List[DriverListItem]:
+        """
+        Comme search_drivers, mais ne charge que les colonnes de la liste
+        """
+        try:
+            stmt = select(*_DRIVER_LIST_COLUMNS)\
+                .join(User, User.id == Driver.user_id)\
+                .where(
+                    and_(
+                        Driver.seller_id == seller_id,
+                        _search_clause(search_term)
+                    )
+                )
+            
+            return await _list_items(db, _paginate(stmt, skip, limit, cursor))
+            
+        except Exception as e:
+            logger.error(f"Erreur recherche liste livreurs: {e}")
+            return []
+    
     @staticmethod
     async def get_available_zones(
-        db: Session,
+        db: AsyncSession,
         seller_id: UUID
     ) -> List[Dict[str, Any]]:
         """
         Récupère les zones de livraison disponibles avec statistiques
         """
         try:
-            from sqlalchemy import distinct
-            
             # Récupérer les zones distinctes avec compteurs
-            zones_stats = db.query(
-                Driver.zone_livraison,
-                func.count(Driver.id).label("total"),
-                func.sum(func.cast(Driver.disponibilite, func.Integer)).label("disponibles")
-            ).filter(
-                Driver.seller_id == seller_id,
-                Driver.zone_livraison.isnot(None),
-                Driver.zone_livraison != ""
-            ).group_by(Driver.zone_livraison)\
-             .order_by(func.count(Driver.id).desc()).all()
+            zones_stats = (await db.execute(
+                select(
+                    Driver.zone_livraison,
+                    func.count(Driver.id).label("total"),
+                    func.count(Driver.id).filter(Driver.disponibilite.is_(True)).label("disponibles")
+                ).where(
+                    Driver.seller_id == seller_id,
+                    Driver.zone_livraison.isnot(None),
+                    Driver.zone_livraison != ""
+                ).group_by(Driver.zone_livraison)
+                 .order_by(func.count(Driver.id).desc())
+            )).all()
             
             result = []
             for zone, total, disponibles in zones_stats:
                 result.append({
                     "zone": zone,
                     "total": total,
-                    "disponibles": disponibles or 0,
-                    "indisponibles": total - (disponibles or 0)
+                    "disponibles": disponibles,
+                    "indisponibles": total - disponibles
                 })
             
             logger.debug(f"Zones récupérées pour vendeur {seller_id}: {len(result)} zones")
@@ -458,7 +753,7 @@ class DriverService:
     
     @staticmethod
     async def get_driver_by_user_id(
-        db: Session,
+        db: AsyncSession,
         user_id: UUID,
         seller_id: UUID
     ) -> Optional[Driver]:
@@ -466,12 +761,14 @@ class DriverService:
         Récupère un livreur par son user_id
         """
         try:
-            driver = db.query(Driver).filter(
-                and_(
-                    Driver.user_id == user_id,
-                    Driver.seller_id == seller_id
-                )
-            ).options(joinedload(Driver.user)).first()
+            driver = await db.scalar(
+                select(Driver).where(
+                    and_(
+                        Driver.user_id == user_id,
+                        Driver.seller_id == seller_id
+                    )
+                ).options(joinedload(Driver.user))
+            )
             
             return driver
             
@@ -481,7 +778,7 @@ class DriverService:
     
     @staticmethod
     async def update_driver_zone(
-        db: Session,
+        db: AsyncSession,
         driver_id: UUID,
         seller_id: UUID,
         new_address: str
@@ -490,45 +787,49 @@ class DriverService:
         Met à jour la zone de livraison d'un livreur basée sur une nouvelle adresse
         """
         try:
-            driver = db.query(Driver).filter(
-                and_(
-                    Driver.id == driver_id,
-                    Driver.seller_id == seller_id
+            driver = await db.scalar(
+                select(Driver).where(
+                    and_(
+                        Driver.id == driver_id,
+                        Driver.seller_id == seller_id
+                    )
                 )
-            ).first()
+            )
             
             if not driver:
                 return None, "Livreur non trouvé"
             
-            # Mettre à jour l'adresse de l'utilisateur
-            user = db.query(User).filter(User.id == driver.user_id).first()
-            if user:
-                user.adresse = new_address
-                user.updated_at = datetime.utcnow()
+            # Mettre à jour l'adresse de l'utilisateur (sans le charger)
+            await db.execute(
+                update(User)
+                .where(User.id == driver.user_id)
+                .values(adresse=new_address)
+                .execution_options(synchronize_session=False)
+            )
             
             # Mettre à jour la zone de livraison avec géocodage
             try:
-                new_zone = geocoding_service.extract_zone_from_address(new_address)
+                new_zone = await _extract_zone(new_address)
                 driver.zone_livraison = new_zone
                 logger.info(f"Zone mise à jour pour livreur {driver_id}: {new_zone}")
             except Exception as e:
                 logger.error(f"Erreur géocodage pour mise à jour zone: {e}")
                 # Garder l'ancienne zone en cas d'erreur
             
-            driver.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(driver)
+            # expire_on_commit=False + eager_defaults : driver (updated_at compris)
+            # reste à jour sans SELECT de rafraîchissement
+            await db.commit()
             
             return driver, "Zone de livraison mise à jour avec succès"
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur mise à jour zone livreur: {e}")
             return None, f"Erreur mise à jour zone: {str(e)}"
     
     @staticmethod
     async def bulk_update_disponibilite(
-        db: Session,
+        db: AsyncSession,
         seller_id: UUID,
         driver_ids: List[UUID],
         disponibilite: bool
@@ -537,43 +838,50 @@ class DriverService:
         Met à jour la disponibilité de plusieurs livreurs en masse
         """
         try:
-            result = db.query(Driver).filter(
-                and_(
-                    Driver.seller_id == seller_id,
-                    Driver.id.in_(driver_ids)
+            # RETURNING : les ids réellement modifiés, sans SELECT supplémentaire
+            updated_ids = (await db.scalars(
+                update(Driver)
+                .where(
+                    and_(
+                        Driver.seller_id == seller_id,
+                        Driver.id.in_(driver_ids)
+                    )
                 )
-            ).update(
-                {Driver.disponibilite: disponibilite, Driver.updated_at: datetime.utcnow()},
-                synchronize_session=False
-            )
+                .values(disponibilite=disponibilite, updated_at=func.now())
+                .returning(Driver.id)
+                .execution_options(synchronize_session=False)
+            )).all()
+            result = len(updated_ids)
             
-            db.commit()
+            await db.commit()
             
             logger.info(f"Disponibilité mise à jour pour {result} livreurs: {disponibilite}")
             return result, f"Disponibilité mise à jour pour {result} livreur(s)"
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur mise à jour disponibilité en masse: {e}")
             return 0, f"Erreur mise à jour: {str(e)}"
     
     @staticmethod
     async def get_drivers_with_pending_status(
-        db: Session,
+        db: AsyncSession,
         seller_id: UUID
     ) -> List[Driver]:
         """
         Récupère les livreurs avec statut 'en_attente' qui nécessitent une validation
         """
         try:
-            drivers = db.query(Driver).join(User, User.id == Driver.user_id)\
-                .filter(
+            drivers = (await db.scalars(
+                select(Driver).join(Driver.user)
+                .where(
                     and_(
                         Driver.seller_id == seller_id,
                         User.statut == "en_attente"
                     )
-                ).options(joinedload(Driver.user))\
-                .order_by(User.created_at.asc()).all()
+                ).options(contains_eager(Driver.user))
+                .order_by(User.created_at.asc())
+            )).all()
             
             return drivers
             
@@ -581,8 +889,5 @@ class DriverService:
             logger.error(f"Erreur récupération livreurs en attente: {e}")
             return []
 
-# Import pour la recherche
-from sqlalchemy import or_
-
 # Export de la classe
 __all__ = ["DriverService"]
\ No newline at end of file
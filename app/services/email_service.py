@@ -1,144 +1,33 @@
 # app/services/email_service.py
-import os
+import asyncio
+import html
+import logging
+import re
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from dotenv import load_dotenv
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from email import policy
+from email.message import EmailMessage
+from dataclasses import dataclass
 
-# ✅ Charger les variables d'environnement depuis .env
-load_dotenv()
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    aiosmtplib = None
+    AIOSMTPLIB_AVAILABLE = False
 
-class EmailService:
-    def __init__(self):
-        # Configuration SMTP depuis .env
-        self.smtp_server = os.getenv('SMTP_HOST', 'smtp.gmail.com')
-        self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
-        self.sender_email = os.getenv('SMTP_USERNAME', '')
-        self.sender_password = os.getenv('SMTP_PASSWORD', '')
-        self.sender_name = os.getenv('FROM_NAME', 'Live Commerce')
-        self.from_email = os.getenv('FROM_EMAIL', self.sender_email)
-        
-        print(f"📧 Configuration SMTP chargée:")
-        print(f"   Serveur: {self.smtp_server}:{self.smtp_port}")
-        print(f"   Utilisateur: {self.sender_email}")
-        print(f"   Expéditeur: {self.sender_name} <{self.from_email}>")
-        
-        # Vérifier la configuration
-        if not self.sender_email or not self.sender_password:
-            print("⚠️ ERREUR: Configuration SMTP incomplète dans .env")
-            print("💡 Vérifiez que SMTP_USERNAME et SMTP_PASSWORD sont définis")
-        else:
-            print("✅ Configuration SMTP OK")
-    
-    def send_email(self, to_email: str, subject: str, html_content: str, text_content: str = "") -> bool:
-        """
-        Envoie un email générique via SMTP avec contenu HTML et texte
-        """
-        try:
-            print(f"📧 Tentative d'envoi SMTP à: {to_email}")
-            print(f"   Sujet: {subject}")
-            
-            # Créer le message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = f"{self.sender_name} <{self.from_email}>"
-            message["To"] = to_email
-            
-            # Si pas de contenu texte, générer depuis HTML
-            if not text_content:
-                import re
-                # Simple conversion HTML -> texte
-                text_content = re.sub('<[^<]+?>', '', html_content)
-                text_content = text_content.replace('&nbsp;', ' ').strip()
-            
-            # Convertir en MIMEText
-            part1 = MIMEText(text_content, "plain", "utf-8")
-            part2 = MIMEText(html_content, "html", "utf-8")
-            
-            # Ajouter les parties au message
-            message.attach(part1)
-            message.attach(part2)
-            
-            # Connexion et envoi
-            print(f"🔗 Connexion à {self.smtp_server}:{self.smtp_port}...")
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
-                server.ehlo()
-                
-                # Démarrer TLS (obligatoire pour Gmail)
-                print("🔐 Démarrage TLS...")
-                server.starttls()
-                server.ehlo()
-                
-                # Authentification
-                print(f"🔑 Authentification en tant que {self.sender_email}...")
-                server.login(self.sender_email, self.sender_password)
-                
-                # Envoi de l'email
-                print("📤 Envoi de l'email...")
-                server.sendmail(self.from_email, to_email, message.as_string())
-                
-                print(f"✅ Email envoyé avec succès à: {to_email}")
-                return True
-                
-        except smtplib.SMTPAuthenticationError as e:
-            print(f"❌ ERREUR d'authentification SMTP: {e}")
-            print("💡 Pour Gmail, assurez-vous que:")
-            print("   1. Vous utilisez un mot de passe d'application (pas votre mot de passe normal)")
-            print("   2. L'authentification 2 facteurs est activée sur votre compte Google")
-            print("   3. Les apps moins sécurisées sont autorisées si vous n'avez pas 2FA")
-            return False
-            
-        except smtplib.SMTPException as e:
-            print(f"❌ ERREUR SMTP: {e}")
-            return False
-            
-        except Exception as e:
-            print(f"❌ ERREUR générale d'envoi d'email: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return False
-    
-    def send_reset_code_email(self, recipient_email: str, reset_code: str) -> bool:
-        """
-        Envoie un email avec le code de réinitialisation via SMTP
-        """
-        try:
-            subject = "Code de réinitialisation - Live Commerce"
-            html_content = self._generate_html_template(reset_code)
-            text_content = self._generate_text_template(reset_code)
-            
-            return self.send_email(recipient_email, subject, html_content, text_content)
-                
-        except Exception as e:
-            print(f"❌ ERREUR lors de l'envoi d'email de réinitialisation: {str(e)}")
-            return False
-    
-    def test_connection(self) -> bool:
-        """Teste la connexion SMTP"""
-        try:
-            print(f"🔍 Test de connexion SMTP à {self.smtp_server}:{self.smtp_port}")
-            
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10) as server:
-                server.ehlo()
-                
-                # Démarrer TLS
-                server.starttls()
-                server.ehlo()
-                
-                # Essayer de se connecter
-                if self.sender_email and self.sender_password:
-                    server.login(self.sender_email, self.sender_password)
-                
-                print("✅ Connexion SMTP réussie")
-                return True
-                
-        except Exception as e:
-            print(f"❌ ERREUR test connexion SMTP: {str(e)}")
-            return False
+from app.core.config import settings
 
-    def _generate_html_template(self, reset_code: str) -> str:
-        """Génère le template HTML basé sur le design fourni"""
-        return f"""
+logger = logging.getLogger(__name__)
+
+# Templates de l'email de réinitialisation ({reset_code} et {from_email}
+# sont substitués par EmailService, pas de formatage à chaque envoi)
+_RESET_HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="fr">
 <head>
@@ -207,8 +96,8 @@ class EmailService:
             </p>
             <p style="color: #6B7280; font-size: 12px; margin: 0;">
                 © 2024 Live Commerce. Tous droits réservés.<br>
-                <a href="mailto:{self.from_email}" style="color: #4F46E5; text-decoration: none;">
-                    {self.from_email}
+                <a href="mailto:{from_email}" style="color: #4F46E5; text-decoration: none;">
+                    {from_email}
                 </a>
             </p>
         </div>
@@ -217,10 +106,8 @@ class EmailService:
 </body>
 </html>
 """
-    
-    def _generate_text_template(self, reset_code: str) -> str:
-        """Génère la version texte"""
-        return f"""LIVE COMMERCE - RÉINITIALISATION DE MOT DE PASSE
+
+_RESET_TEXT_TEMPLATE = """LIVE COMMERCE - RÉINITIALISATION DE MOT DE PASSE
 
 Bonjour,
 
@@ -240,7 +127,7 @@ Instructions :
 • Ne partagez jamais ce code avec qui que ce soit
 • Si vous n'avez pas fait cette demande, ignorez cet email
 
-Besoin d'aide ? Contactez-nous à : {self.from_email}
+Besoin d'aide ? Contactez-nous à : {from_email}
 
 --
 Live Commerce
@@ -248,5 +135,454 @@ Votre marketplace de confiance
 © 2024 Live Commerce. Tous droits réservés.
 """
 
+@lru_cache(maxsize=8)
+def _split_template(template: str, from_email: str) -> Tuple[str, str]:
+    """Résout {from_email} et découpe le template autour de {reset_code}"""
+    prefix, suffix = template.replace("{from_email}", from_email).split("{reset_code}")
+    return prefix, suffix
+
+# Rendus mémorisés par code : les renvois d'un même code (15 min) ne
+# reconstruisent pas le corps de l'email
+@lru_cache(maxsize=1024)
+def _render_reset_html(reset_code: str, from_email: str) -> str:
+    prefix, suffix = _split_template(_RESET_HTML_TEMPLATE, from_email)
+    return prefix + reset_code + suffix
+
+@lru_cache(maxsize=1024)
+def _render_reset_text(reset_code: str, from_email: str) -> str:
+    prefix, suffix = _split_template(_RESET_TEXT_TEMPLATE, from_email)
+    return prefix + reset_code + suffix
+
+RESET_EMAIL_SUBJECT = "Code de réinitialisation - Live Commerce"
+
+# Message de réinitialisation sérialisé (encodage base64 compris), mémorisé
+# par code et destinataire pour les renvois
+@lru_cache(maxsize=1024)
+def _build_reset_mime_bytes(reset_code: str, to_email: str, from_header: str, from_email: str) -> bytes:
+    return _build_mime_message(
+        to_email,
+        RESET_EMAIL_SUBJECT,
+        from_header,
+        _render_reset_html(reset_code, from_email),
+        _render_reset_text(reset_code, from_email)
+    ).as_bytes()
+
+# Conversion HTML -> texte pour les emails sans version texte
+_TAG_RE = re.compile(r'<[^<]+?>')
+_NBSP_TO_SPACE = str.maketrans({'\xa0': ' '})
+
+def _html_to_text(html_content: str) -> str:
+    """Retire les balises et décode les entités HTML (&nbsp; devient un espace)"""
+    return html.unescape(_TAG_RE.sub('', html_content)).translate(_NBSP_TO_SPACE).strip()
+
+def _build_mime_message(
+    to_email: Optional[str],
+    subject: str,
+    from_header: str,
+    html_content: str,
+    text_content: str
+) -> EmailMessage:
+    """Construit le message multipart/alternative (texte + HTML), sans "To:" si to_email est None"""
+    message = EmailMessage(policy=policy.SMTP)
+    message["Subject"] = subject
+    message["From"] = from_header
+    if to_email is not None:
+        message["To"] = to_email
+    
+    # Si pas de contenu texte, générer depuis HTML
+    if not text_content:
+        text_content = _html_to_text(html_content)
+    
+    message.set_content(text_content)
+    message.add_alternative(html_content, subtype="html")
+    return message
+
+def _to_header(recipient: str) -> bytes:
+    """
+    Ligne d'en-tête "To:" encodée par la politique SMTP de EmailMessage
+    (ValueError si l'adresse contient CR/LF : pas d'injection d'en-têtes)
+    """
+    name, value = policy.SMTP.header_store_parse("To", recipient)
+    return policy.SMTP.fold_binary(name, value)
+
+# Contexte TLS partagé : magasin de certificats chargé une seule fois
+_TLS_CTX = ssl.create_default_context()
+_TLS_CTX.minimum_version = ssl.TLSVersion.TLSv1_2
+
+# Pool de connexions SMTP (désactivé par défaut : SMTP_POOL_ENABLED=true pour l'activer)
+SMTP_POOL_ENABLED = settings.SMTP_POOL_ENABLED
+SMTP_POOL_SIZE = settings.SMTP_POOL_SIZE
+SMTP_MAX_USES_PER_CONN = settings.SMTP_MAX_USES_PER_CONN
+SMTP_MAX_CONN_AGE = settings.SMTP_MAX_CONN_AGE
+
+class SMTPPool:
+    """
+    Pool borné de connexions SMTP déjà authentifiées (EHLO/STARTTLS/AUTH faits
+    une seule fois), réutilisées entre envois puis recyclées après
+    max_uses messages ou max_age secondes
+    """
+    
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        max_size: int = SMTP_POOL_SIZE,
+        max_uses: int = SMTP_MAX_USES_PER_CONN,
+        max_age: float = SMTP_MAX_CONN_AGE
+    ):
+        self._connect = connect
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.max_age = max_age
+        # (connexion, création, nombre d'envois)
+        self._idle: List[Tuple[smtplib.SMTP, float, int]] = []
+        self._lock = threading.RLock()
+    
+    def _expired(self, created: float, uses: int) -> bool:
+        return uses >= self.max_uses or time.monotonic() - created >= self.max_age
+    
+    @staticmethod
+    def _discard(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def _checkout(self) -> Tuple[smtplib.SMTP, float, int]:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, created, uses = self._idle.pop()
+            
+            if self._expired(created, uses):
+                self._discard(server)
+                continue
+            try:
+                if server.noop()[0] == 250:
+                    return server, created, uses
+            except (smtplib.SMTPException, OSError):
+                pass
+            # Connexion fermée côté serveur : en ouvrir une autre
+            self._discard(server)
+        
+        return self._connect(), time.monotonic(), 0
+    
+    def _checkin(self, server: smtplib.SMTP, created: float, uses: int) -> None:
+        if not self._expired(created, uses):
+            try:
+                server.rset()
+                with self._lock:
+                    if len(self._idle) < self.max_size:
+                        self._idle.append((server, created, uses))
+                        return
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._discard(server)
+    
+    @contextmanager
+    def acquire(self) -> Iterator[smtplib.SMTP]:
+        """Fournit une connexion vivante, rendue au pool après usage"""
+        server, created, uses = self._checkout()
+        try:
+            yield server
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self._discard(server)
+            raise
+        except Exception:
+            self._checkin(server, created, uses + 1)
+            raise
+        else:
+            self._checkin(server, created, uses + 1)
+    
+    def close(self) -> None:
+        """Ferme toutes les connexions inactives"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _, _ in idle:
+            self._discard(server)
+
+# Pool partagé par toutes les instances d'EmailService (créé au premier envoi)
+_smtp_pool: Optional[SMTPPool] = None
+_smtp_pool_lock = threading.Lock()
+
+def close_smtp_pool() -> None:
+    """Ferme le pool SMTP partagé (arrêt de l'application)"""
+    global _smtp_pool
+    with _smtp_pool_lock:
+        pool, _smtp_pool = _smtp_pool, None
+    if pool is not None:
+        pool.close()
+
+def _log_auth_error(error: Exception) -> None:
+    logger.error(
+        "❌ ERREUR d'authentification SMTP: %s\n"
+        "💡 Pour Gmail, assurez-vous que:\n"
+        "   1. Vous utilisez un mot de passe d'application (pas votre mot de passe normal)\n"
+        "   2. L'authentification 2 facteurs est activée sur votre compte Google\n"
+        "   3. Les apps moins sécurisées sont autorisées si vous n'avez pas 2FA",
+        error
+    )
+
+@dataclass(frozen=True, slots=True)
+class SMTPConfig:
+    """Configuration SMTP, lue une seule fois depuis les settings"""
+    smtp_server: str
+    smtp_port: int
+    sender_email: str
+    sender_password: str
+    sender_name: str
+    from_email: str
+    
+    @classmethod
+    def from_settings(cls) -> "SMTPConfig":
+        sender_email = settings.SMTP_USERNAME or ""
+        # Sans FROM_EMAIL explicite, l'expéditeur est le compte SMTP
+        from_email = settings.FROM_EMAIL if "FROM_EMAIL" in settings.model_fields_set else sender_email
+        return cls(
+            smtp_server=settings.SMTP_HOST,
+            smtp_port=settings.SMTP_PORT,
+            sender_email=sender_email,
+            sender_password=settings.SMTP_PASSWORD or "",
+            sender_name=settings.FROM_NAME,
+            from_email=from_email
+        )
+
+SMTP_CONFIG = SMTPConfig.from_settings()
+
+logger.info(
+    "📧 Configuration SMTP chargée: %s:%s, utilisateur %s, expéditeur %s <%s>",
+    SMTP_CONFIG.smtp_server, SMTP_CONFIG.smtp_port, SMTP_CONFIG.sender_email,
+    SMTP_CONFIG.sender_name, SMTP_CONFIG.from_email
+)
+if not SMTP_CONFIG.sender_email or not SMTP_CONFIG.sender_password:
+    logger.warning(
+        "⚠️ ERREUR: Configuration SMTP incomplète dans .env "
+        "(vérifiez que SMTP_USERNAME et SMTP_PASSWORD sont définis)"
+    )
+else:
+    logger.info("✅ Configuration SMTP OK")
+
+class EmailService:
+    def __init__(self, config: Optional[SMTPConfig] = None):
+        # Configuration SMTP partagée (copie d'attributs, pas de relecture de l'environnement)
+        config = config or SMTP_CONFIG
+        self.smtp_server = config.smtp_server
+        self.smtp_port = config.smtp_port
+        self.sender_email = config.sender_email
+        self.sender_password = config.sender_password
+        self.sender_name = config.sender_name
+        self.from_email = config.from_email
+        self._from_header = f"{self.sender_name} <{self.from_email}>"
+    
+    def send_email(self, to_email: str, subject: str, html_content: str, text_content: str = "") -> bool:
+        """
+        Envoie un email générique via SMTP avec contenu HTML et texte
+        """
+        try:
+            logger.debug("📧 Tentative d'envoi SMTP à: %s (sujet: %s)", to_email, subject)
+            message = _build_mime_message(to_email, subject, self._from_header, html_content, text_content)
+        except Exception as e:
+            logger.error("❌ ERREUR générale d'envoi d'email: %s", e, exc_info=True)
+            return False
+        
+        return self._send_bytes(to_email, message.as_bytes())
+    
+    async def send_email_async(self, to_email: str, subject: str, html_content: str, text_content: str = "") -> bool:
+        """
+        Version asynchrone de send_email (aiosmtplib) : n'immobilise pas la
+        boucle d'événements pendant les échanges SMTP
+        """
+        try:
+            logger.debug("📧 Tentative d'envoi SMTP (async) à: %s", to_email)
+            message = _build_mime_message(to_email, subject, self._from_header, html_content, text_content)
+        except Exception as e:
+            logger.error("❌ ERREUR générale d'envoi d'email: %s", e)
+            return False
+        
+        return await self._send_bytes_async(to_email, message.as_bytes())
+    
+    def _send_bytes(self, to_email: str, data: bytes) -> bool:
+        """Transmet un message déjà sérialisé (connexion du pool ou dédiée)"""
+        try:
+            connection = self._get_pool().acquire() if SMTP_POOL_ENABLED else self._open_connection()
+            with connection as server:
+                logger.debug("📤 Envoi de l'email...")
+                server.sendmail(self.from_email, to_email, data)
+            
+            logger.info("✅ Email envoyé avec succès à: %s", to_email)
+            return True
+                
+        except smtplib.SMTPAuthenticationError as e:
+            _log_auth_error(e)
+            return False
+            
+        except smtplib.SMTPException as e:
+            logger.error("❌ ERREUR SMTP: %s", e)
+            return False
+            
+        except Exception as e:
+            logger.error("❌ ERREUR générale d'envoi d'email: %s", e, exc_info=True)
+            return False
+    
+    def send_bulk(
+        self,
+        recipients: List[str],
+        subject: str,
+        html_content: str,
+        text_content: str = ""
+    ) -> Dict[str, bool]:
+        """
+        Envoie le même email à plusieurs destinataires sur une seule connexion
+        authentifiée (un message par destinataire, corps sérialisé une fois)
+        """
+        results = {recipient: False for recipient in recipients}
+        if not recipients:
+            return results
+        
+        try:
+            # En-têtes communs + corps encodés une seule fois ; seul "To:" varie
+            data = _build_mime_message(None, subject, self._from_header, html_content, text_content).as_bytes()
+            
+            connection = self._get_pool().acquire() if SMTP_POOL_ENABLED else self._open_connection()
+            with connection as server:
+                for recipient in recipients:
+                    try:
+                        to_header = _to_header(recipient)
+                    except ValueError as e:
+                        logger.error("❌ Adresse refusée %r: %s", recipient, e)
+                        continue
+                    try:
+                        server.sendmail(self.from_email, recipient, to_header + data)
+                        results[recipient] = True
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, UnicodeEncodeError) as e:
+                        # Destinataire refusé : on passe au suivant
+                        logger.error("❌ ERREUR SMTP pour %s: %s", recipient, e)
+                        server.rset()
+            
+        except smtplib.SMTPAuthenticationError as e:
+            _log_auth_error(e)
+            
+        except smtplib.SMTPException as e:
+            logger.error("❌ ERREUR SMTP: %s", e)
+            
+        except Exception as e:
+            logger.error("❌ ERREUR générale d'envoi d'email: %s", e, exc_info=True)
+        
+        logger.info("✅ Envoi groupé: %d/%d emails envoyés", sum(results.values()), len(recipients))
+        return results
+    
+    async def _send_bytes_async(self, to_email: str, data: bytes) -> bool:
+        """Version asynchrone de _send_bytes"""
+        if not AIOSMTPLIB_AVAILABLE:
+            # Repli : envoi synchrone dans un thread
+            return await asyncio.to_thread(self._send_bytes, to_email, data)
+        
+        try:
+            async with aiosmtplib.SMTP(
+                hostname=self.smtp_server,
+                port=self.smtp_port,
+                start_tls=True,
+                tls_context=_TLS_CTX,
+                timeout=30
+            ) as server:
+                await server.login(self.sender_email, self.sender_password)
+                await server.sendmail(self.from_email, [to_email], data)
+            
+            logger.info("✅ Email envoyé avec succès à: %s", to_email)
+            return True
+        
+        except aiosmtplib.SMTPAuthenticationError as e:
+            _log_auth_error(e)
+            return False
+        
+        except aiosmtplib.SMTPException as e:
+            logger.error("❌ ERREUR SMTP: %s", e)
+            return False
+        
+        except Exception as e:
+            logger.error("❌ ERREUR générale d'envoi d'email: %s", e)
+            return False
+    
+    def _open_connection(self, timeout: int = 30) -> smtplib.SMTP:
+        """Ouvre une connexion SMTP chiffrée et authentifiée"""
+        logger.debug("🔗 Connexion à %s:%s...", self.smtp_server, self.smtp_port)
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=timeout)
+        try:
+            server.ehlo()
+            
+            # Démarrer TLS (obligatoire pour Gmail)
+            logger.debug("🔐 Démarrage TLS...")
+            server.starttls(context=_TLS_CTX)
+            server.ehlo()
+            
+            # Authentification
+            logger.debug("🔑 Authentification en tant que %s...", self.sender_email)
+            server.login(self.sender_email, self.sender_password)
+            return server
+        except Exception:
+            server.close()
+            raise
+    
+    def _get_pool(self) -> SMTPPool:
+        """Retourne le pool SMTP partagé, créé à la première utilisation"""
+        global _smtp_pool
+        with _smtp_pool_lock:
+            if _smtp_pool is None:
+                _smtp_pool = SMTPPool(self._open_connection)
+            return _smtp_pool
+    
+    def send_reset_code_email(self, recipient_email: str, reset_code: str) -> bool:
+        """
+        Envoie un email avec le code de réinitialisation via SMTP
+        """
+        try:
+            data = _build_reset_mime_bytes(reset_code, recipient_email, self._from_header, self.from_email)
+            return self._send_bytes(recipient_email, data)
+                
+        except Exception as e:
+            logger.error("❌ ERREUR lors de l'envoi d'email de réinitialisation: %s", e)
+            return False
+    
+    async def send_reset_code_email_async(self, recipient_email: str, reset_code: str) -> bool:
+        """Version asynchrone de send_reset_code_email"""
+        try:
+            data = _build_reset_mime_bytes(reset_code, recipient_email, self._from_header, self.from_email)
+            return await self._send_bytes_async(recipient_email, data)
+                
+        except Exception as e:
+            logger.error("❌ ERREUR lors de l'envoi d'email de réinitialisation: %s", e)
+            return False
+    
+    def test_connection(self) -> bool:
+        """Teste la connexion SMTP"""
+        try:
+            logger.info("🔍 Test de connexion SMTP à %s:%s", self.smtp_server, self.smtp_port)
+            
+            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10) as server:
+                server.ehlo()
+                
+                # Démarrer TLS
+                server.starttls(context=_TLS_CTX)
+                server.ehlo()
+                
+                # Essayer de se connecter
+                if self.sender_email and self.sender_password:
+                    server.login(self.sender_email, self.sender_password)
+                
+                logger.info("✅ Connexion SMTP réussie")
+                return True
+                
+        except Exception as e:
+            logger.error("❌ ERREUR test connexion SMTP: %s", e)
+            return False
+
+    def _generate_html_template(self, reset_code: str) -> str:
+        """Génère le template HTML basé sur le design fourni"""
+        return _render_reset_html(reset_code, self.from_email)
+    
+    def _generate_text_template(self, reset_code: str) -> str:
+        """Génère la version texte"""
+        return _render_reset_text(reset_code, self.from_email)
+
 # Instance globale
 email_service = EmailService()
\ No newline at end of file
@@ -1,21 +1,106 @@
 import httpx
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
-from urllib.parse import urlencode
+import time
+from functools import lru_cache
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timezone
+from urllib.parse import quote_plus, urlencode
 from app.core.config import settings
+from app.services.facebook_http import get_shared_client, is_shared_client
 import json
+import msgspec
+
+# Lecture incrémentale des listes de pages (/me/accounts) si ijson est installé
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# SCOPES ESSENTIELS
+OAUTH_SCOPES = (
+    "email",
+    "public_profile",
+    "pages_show_list",
+    "pages_read_engagement",
+    "pages_manage_posts",
+    "pages_manage_engagement",
+    "pages_messaging",
+    "business_management",
+)
+
+# Champs demandés pour l'utilisateur et ses pages (/me, /me/accounts)
+USER_FIELDS = "id,name,first_name,last_name,email,picture{url}"
+PAGE_FIELDS = "id,name,category,fan_count,about,access_token,picture{url},cover{source},tasks"
+
+# Décodage JSON des réponses Graph API (msgspec, plus rapide que json)
+_json_decoder = msgspec.json.Decoder()
+
+def _json(response: httpx.Response) -> Any:
+    return _json_decoder.decode(response.content)
+
+# URLs OAuth déjà construites (une par `state`, c.-à-d. par vendeur)
+OAUTH_URL_CACHE_SIZE = 1024
+
+class _AsyncByteReader:
+    """Adapte response.aiter_bytes() à l'interface `await read(n)` attendue par ijson"""
+    
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+    
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            # ijson sonde le type de flux avec read(0) : ne rien consommer
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+# Durée à partir de laquelle le token obtenu est déjà long-lived (Facebook
+# annonce un peu moins de 60 jours) : pas d'échange fb_exchange_token
+LONG_LIVED_MIN_EXPIRES_IN = 59 * 24 * 3600
+
+# Tasks de page donnant les droits d'administration
+_ADMIN_TASKS = frozenset({"ADMINISTER", "MANAGE"})
+
+@dataclass(slots=True)
+class PageRecord:
+    """Page Facebook formatée depuis /me/accounts (slots : pas de __dict__ par page)"""
+    id: str = ""
+    name: str = "Page sans nom"
+    category: Optional[str] = None
+    fan_count: int = 0
+    about: Optional[str] = None
+    access_token: str = ""
+    is_selected: bool = False
+    profile_pic_url: Optional[str] = None
+    cover_photo_url: Optional[str] = None
+    tasks: List[str] = field(default_factory=list)
+    is_admin: bool = False
+    can_create_content: bool = False
+    can_moderate: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+# Requête batch Graph API : /me + /me/accounts en un seul aller-retour
+_PROFILE_BATCH = json.dumps([
+    {"method": "GET", "relative_url": f"me?{urlencode({'fields': USER_FIELDS})}"},
+    {"method": "GET", "relative_url": f"me/accounts?{urlencode({'fields': PAGE_FIELDS, 'limit': 100})}"},
+])
+
 class FacebookAuthService:
     """
     Service d'authentification Facebook pour Live Commerce
     Version PRODUCTION corrigée et robuste
     """
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         # Configuration avec validation
         self.app_id = settings.FACEBOOK_APP_ID or ""
         self.app_secret = settings.FACEBOOK_APP_SECRET or ""
@@ -28,56 +113,40 @@ class FacebookAuthService:
             # On continue quand même mais en mode dégradé
         
         self.base_url = f"https://graph.facebook.com/{self.api_version}"
-        logger.info(f"✅ FacebookAuthService initialisé")
+        self._token_url = f"{self.base_url}/oauth/access_token"
+        self._me_url = f"{self.base_url}/me"
+        self._accounts_url = f"{self.base_url}/me/accounts"
         
-        # Client HTTP réutilisable avec meilleurs timeouts
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0, connect=10.0),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-            headers={
-                'User-Agent': 'LiveCommerceApp/1.0',
-                'Accept': 'application/json',
-            }
-        )
+        # URL OAuth sans `state` (paramètres constants, encodés une seule fois)
+        oauth_params = urlencode({
+            "client_id": self.app_id,
+            "redirect_uri": self.redirect_uri,
+            "scope": ",".join(OAUTH_SCOPES),
+            "response_type": "code",
+            "auth_type": "rerequest",
+        })
+        self._oauth_url_base = f"https://www.facebook.com/{self.api_version}/dialog/oauth?{oauth_params}"
+        self._oauth_url_for_state = lru_cache(maxsize=OAUTH_URL_CACHE_SIZE)(self._build_oauth_url)
+        logger.info("✅ FacebookAuthService initialisé")
+        
+        # Client HTTP partagé entre les services Facebook (sauf client injecté)
+        self.client = client or get_shared_client()
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        await self.close()
     
     def get_oauth_url(self, state: str = None) -> str:
         """
         🔥 CORRIGÉ: Génère l'URL OAuth 2.0 optimisée
+        (URL de base construite une fois dans __init__, seul `state` varie)
         """
-        # SCOPES ESSENTIELS
-        essential_scopes = [
-            "email",
-            "public_profile",
-            "pages_show_list",
-            "pages_read_engagement",
-            "pages_manage_posts",
-            "pages_manage_engagement",
-            "pages_messaging",
-            "business_management",
-        ]
-        
-        params = {
-            "client_id": self.app_id,
-            "redirect_uri": self.redirect_uri,
-            "scope": ",".join(essential_scopes),
-            "response_type": "code",
-            "auth_type": "rerequest",
-        }
-        
-        if state:
-            params["state"] = str(state)
-        
-        base_auth_url = f"https://www.facebook.com/{self.api_version}/dialog/oauth"
-        oauth_url = f"{base_auth_url}?{urlencode(params)}"
-        
-        logger.info(f"🔗 URL OAuth générée")
-        return oauth_url
+        return self._oauth_url_for_state(str(state)) if state else self._oauth_url_base
+    
+    def _build_oauth_url(self, state: str) -> str:
+        return f"{self._oauth_url_base}&state={quote_plus(state)}"
     
     async def exchange_code_for_token(self, code: str) -> Dict[str, Any]:
         """
@@ -86,11 +155,11 @@ class FacebookAuthService:
         if not code or code.strip() == "":
             raise ValueError("Code d'autorisation vide ou invalide")
         
-        logger.info(f"🔄 Échange code contre token")
+        logger.debug("🔄 Échange code contre token")
         
         try:
             # Étape 1: Token court terme
-            token_url = f"{self.base_url}/oauth/access_token"
+            token_url = self._token_url
             params = {
                 "client_id": self.app_id,
                 "client_secret": self.app_secret,
@@ -98,37 +167,43 @@ class FacebookAuthService:
                 "code": code.strip(),
             }
             
-            logger.debug(f"📤 Requête token: {token_url}")
+            logger.debug("📤 Requête token: %s", token_url)
             response = await self.client.get(token_url, params=params)
             
             if response.status_code != 200:
                 error_data = self._parse_facebook_error(response)
                 error_msg = error_data.get("message", "Erreur inconnue")
-                logger.error(f"❌ Facebook OAuth error: {error_msg}")
+                logger.error("❌ Facebook OAuth error: %s", error_msg)
                 raise Exception(f"Erreur Facebook OAuth: {error_msg}")
             
-            token_data = response.json()
+            token_data = _json(response)
             access_token = token_data.get("access_token")
             
             if not access_token:
                 raise Exception("Facebook n'a pas retourné de token d'accès")
             
-            logger.info(f"✅ Token obtenu")
+            logger.info("✅ Token obtenu")
             
-            # Étape 2: Essayer le token long-lived
-            try:
-                long_token_data = await self._get_long_lived_token(access_token)
-                token_data.update(long_token_data)
-                logger.info("✅ Token long-lived obtenu")
-            except Exception as e:
-                logger.warning(f"⚠️ Token long-lived échoué: {e}")
-                # On garde le token court
-                token_data["token_type"] = "short"
+            # Étape 2: Essayer le token long-lived (sauf si le token l'est déjà)
+            if (
+                not settings.FACEBOOK_FORCE_LONG_LIVED
+                and token_data.get("expires_in", 0) >= LONG_LIVED_MIN_EXPIRES_IN
+            ):
+                token_data["token_type"] = "long"
+                logger.info("✅ Token déjà long-lived, échange ignoré")
+            else:
+                try:
+                    long_token_data = await self._get_long_lived_token(access_token)
+                    token_data.update(long_token_data)
+                    logger.info("✅ Token long-lived obtenu")
+                except Exception as e:
+                    logger.warning("⚠️ Token long-lived échoué: %s", e)
+                    # On garde le token court
+                    token_data["token_type"] = "short"
             
             # Ajouter l'expiration
             expires_in = token_data.get("expires_in", 7200)
-            expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
-            token_data["expires_at"] = expires_at.isoformat()
+            token_data["expires_at"] = self.calculate_token_expiry(expires_in).isoformat()
             
             return token_data
             
@@ -136,18 +211,18 @@ class FacebookAuthService:
             logger.error("⏱️ Timeout Facebook OAuth")
             raise Exception("Timeout lors de la connexion à Facebook")
         except httpx.RequestError as e:
-            logger.error(f"🌐 Erreur réseau: {e}")
+            logger.error("🌐 Erreur réseau: %s", e)
             # 🔥 CORRECTION: Meilleur message d'erreur réseau
             raise Exception(f"Erreur réseau: Impossible de se connecter à Facebook. Vérifiez votre connexion internet.")
         except Exception as e:
-            logger.error(f"💥 Erreur inattendue: {e}")
+            logger.error("💥 Erreur inattendue: %s", e)
             raise
     
     async def _get_long_lived_token(self, short_lived_token: str) -> Dict[str, Any]:
         """
         🔥 CORRIGÉ: Obtient un token long-lived
         """
-        token_url = f"{self.base_url}/oauth/access_token"
+        token_url = self._token_url
         params = {
             "grant_type": "fb_exchange_token",
             "client_id": self.app_id,
@@ -161,7 +236,7 @@ class FacebookAuthService:
             error_data = self._parse_facebook_error(response)
             raise Exception(f"Long-lived token failed: {error_data.get('message')}")
         
-        token_data = response.json()
+        token_data = _json(response)
         token_data["token_type"] = "long"
         return token_data
     
@@ -169,125 +244,192 @@ class FacebookAuthService:
         """
         🔥 CORRIGÉ: Récupère les infos utilisateur
         """
-        user_url = f"{self.base_url}/me"
+        user_url = self._me_url
         params = {
-            "fields": "id,name,first_name,last_name,email,picture{url}",
+            "fields": USER_FIELDS,
             "access_token": access_token,
         }
         
         try:
-            logger.debug(f"📥 Récupération infos utilisateur...")
+            logger.debug("📥 Récupération infos utilisateur...")
             response = await self.client.get(user_url, params=params)
             
             if response.status_code != 200:
                 error_data = self._parse_facebook_error(response)
                 raise Exception(f"Facebook API Error: {error_data.get('message')}")
             
-            user_data = response.json()
-            
-            formatted_data = {
-                "id": user_data.get("id", ""),
-                "name": user_data.get("name", ""),
-                "first_name": user_data.get("first_name", ""),
-                "last_name": user_data.get("last_name", ""),
-                "email": user_data.get("email", ""),
-            }
-            
-            if "picture" in user_data and "data" in user_data["picture"]:
-                formatted_data["profile_pic_url"] = user_data["picture"]["data"].get("url", "")
+            formatted_data = self._format_user_data(_json(response))
             
-            logger.info(f"👤 Utilisateur récupéré: {formatted_data.get('name')}")
+            logger.info("👤 Utilisateur récupéré: %s", formatted_data.get('name'))
             return formatted_data
             
         except httpx.RequestError as e:
             # 🔥 CORRECTION: Meilleure gestion des erreurs réseau
-            logger.error(f"❌ Erreur réseau récupération utilisateur: {e}")
+            logger.error("❌ Erreur réseau récupération utilisateur: %s", e)
             raise Exception(f"Erreur réseau: Impossible de récupérer les infos utilisateur. Code erreur: {getattr(e, 'errno', 'N/A')}")
         except Exception as e:
-            logger.error(f"❌ Erreur récupération utilisateur: {e}")
+            logger.error("❌ Erreur récupération utilisateur: %s", e)
             raise
     
-    async def get_user_pages(self, user_access_token: str) -> List[Dict[str, Any]]:
+    async def get_user_pages(self, user_access_token: str) -> List[PageRecord]:
         """
         🔥 CORRIGÉ: Récupère les pages Facebook SANS le champ 'perms' obsolète
         """
-        pages_url = f"{self.base_url}/me/accounts"
+        pages_url = self._accounts_url
         
         # 🔥 CORRECTION: Retirer 'perms' qui n'existe plus
         # Utiliser 'tasks' à la place pour les permissions
         params = {
             "access_token": user_access_token,
-            "fields": "id,name,category,fan_count,about,access_token,picture{url},cover{source},tasks",
+            "fields": PAGE_FIELDS,
             "limit": 100,
         }
         
         try:
             logger.info("📄 Récupération pages Facebook...")
-            response = await self.client.get(pages_url, params=params)
-            
-            if response.status_code != 200:
-                error_data = self._parse_facebook_error(response)
-                error_msg = error_data.get("message", "Erreur inconnue")
-                
-                # Gérer les erreurs de permission
-                if "permission" in error_msg.lower() or "OAuthException" in error_msg:
-                    logger.error(f"🔒 Permission insuffisante: {error_msg}")
-                    raise Exception("Permissions Facebook insuffisantes. Veuillez réautoriser l'application avec toutes les permissions nécessaires.")
-                
-                logger.error(f"❌ Erreur API Facebook: {error_msg}")
-                raise Exception(f"Erreur Facebook API: {error_msg}")
             
-            result = response.json()
-            pages_data = result.get("data", [])
+            if IJSON_AVAILABLE:
+                # Pages formatées au fil de la lecture, sans charger tout le JSON
+                async with self.client.stream("GET", pages_url, params=params) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        self._raise_pages_error(response)
+                    formatted_pages = [
+                        self._format_page_data(page)
+                        async for page in ijson.items(_AsyncByteReader(response), "data.item", use_float=True)
+                    ]
+            else:
+                response = await self.client.get(pages_url, params=params)
+                if response.status_code != 200:
+                    self._raise_pages_error(response)
+                result = _json(response)
+                formatted_pages = [self._format_page_data(page) for page in result.get("data", [])]
             
-            formatted_pages = []
-            for page in pages_data:
-                formatted_page = self._format_page_data(page)
-                formatted_pages.append(formatted_page)
-            
-            logger.info(f"✅ {len(formatted_pages)} pages récupérées")
+            logger.info("✅ %d pages récupérées", len(formatted_pages))
             return formatted_pages
             
         except httpx.RequestError as e:
             # 🔥 CORRECTION: Meilleure gestion des erreurs réseau
-            logger.error(f"🌐 Erreur réseau récupération pages: {e}")
+            logger.error("🌐 Erreur réseau récupération pages: %s", e)
             raise Exception(f"Erreur réseau lors de la récupération des pages. Vérifiez votre connexion internet.")
         except Exception as e:
-            logger.error(f"❌ Erreur récupération pages: {e}")
+            logger.error("❌ Erreur récupération pages: %s", e)
             raise
     
-    def _format_page_data(self, page_data: Dict) -> Dict[str, Any]:
+    def _raise_pages_error(self, response: httpx.Response) -> None:
+        """Lève l'erreur adaptée à une réponse /me/accounts en échec"""
+        error_data = self._parse_facebook_error(response)
+        error_msg = error_data.get("message", "Erreur inconnue")
+        
+        # Gérer les erreurs de permission
+        if "permission" in error_msg.lower() or "OAuthException" in error_msg:
+            logger.error("🔒 Permission insuffisante: %s", error_msg)
+            raise Exception("Permissions Facebook insuffisantes. Veuillez réautoriser l'application avec toutes les permissions nécessaires.")
+        
+        logger.error("❌ Erreur API Facebook: %s", error_msg)
+        raise Exception(f"Erreur Facebook API: {error_msg}")
+    
+    async def get_user_info_and_pages(self, access_token: str) -> Tuple[Dict[str, Any], List[PageRecord]]:
         """
-        🔥 CORRIGÉ: Formate les données de page SANS 'perms'
+        Récupère les infos utilisateur et ses pages (avec leurs access_token,
+        déjà inclus dans /me/accounts : aucun appel par page) en une seule
+        requête batch. Une erreur sur les pages n'est pas bloquante : liste vide.
+        """
+        try:
+            response = await self.client.post(
+                self.base_url,
+                data={"access_token": access_token, "batch": _PROFILE_BATCH, "include_headers": "false"}
+            )
+            if response.status_code != 200:
+                raise Exception(self._parse_facebook_error(response).get("message"))
+            user_part, pages_part = _json(response)
+            if not user_part or not pages_part:
+                raise Exception("réponse batch incomplète")
+        except Exception as e:
+            # Repli : les deux appels séparés, en parallèle
+            logger.warning("⚠️ Requête batch Facebook échouée (%s), appels séparés", e)
+            return await self._get_user_info_and_pages_separately(access_token)
+        
+        user_body = _json_decoder.decode(user_part.get("body") or "{}")
+        if user_part.get("code") != 200:
+            message = user_body.get("error", {}).get("message")
+            logger.error("❌ Erreur récupération utilisateur: %s", message)
+            raise Exception(f"Facebook API Error: {message}")
+        user_info = self._format_user_data(user_body)
+        
+        pages_body = _json_decoder.decode(pages_part.get("body") or "{}")
+        if pages_part.get("code") == 200:
+            pages = [self._format_page_data(page) for page in pages_body.get("data", [])]
+        else:
+            logger.warning("⚠️ Pages non récupérées: %s", pages_body.get('error', {}).get('message'))
+            pages = []
+        
+        logger.info("👤 Utilisateur récupéré: %s, %d pages", user_info.get("name"), len(pages))
+        return user_info, pages
+    
+    async def fetch_profile_bundle(self, access_token: str) -> List[Any]:
+        """
+        Lance get_user_info et get_user_pages en parallèle (appels
+        indépendants) ; chaque résultat est la valeur ou l'exception levée
         """
-        formatted = {
-            "id": page_data.get("id", ""),
-            "name": page_data.get("name", "Page sans nom"),
-            "category": page_data.get("category"),
-            "fan_count": page_data.get("fan_count", 0),
-            "about": page_data.get("about"),
-            "access_token": page_data.get("access_token", ""),
-            "is_selected": False,
+        return await asyncio.gather(
+            self.get_user_info(access_token),
+            self.get_user_pages(access_token),
+            return_exceptions=True
+        )
+    
+    async def _get_user_info_and_pages_separately(self, access_token: str) -> Tuple[Dict[str, Any], List[PageRecord]]:
+        """Infos utilisateur et pages via deux appels parallèles"""
+        user_info, pages = await self.fetch_profile_bundle(access_token)
+        if isinstance(user_info, BaseException):
+            raise user_info
+        if isinstance(pages, BaseException):
+            logger.warning("⚠️ Pages non récupérées: %s", pages)
+            pages = []
+        return user_info, pages
+    
+    def _format_user_data(self, user_data: Dict) -> Dict[str, Any]:
+        """Formate les données utilisateur de /me"""
+        formatted_data = {
+            "id": user_data.get("id", ""),
+            "name": user_data.get("name", ""),
+            "first_name": user_data.get("first_name", ""),
+            "last_name": user_data.get("last_name", ""),
+            "email": user_data.get("email", ""),
         }
         
-        # Photo de profil
-        if "picture" in page_data and "data" in page_data["picture"]:
-            formatted["profile_pic_url"] = page_data["picture"]["data"].get("url")
+        if "picture" in user_data and "data" in user_data["picture"]:
+            formatted_data["profile_pic_url"] = user_data["picture"]["data"].get("url", "")
         
-        # Photo de couverture
-        if "cover" in page_data:
-            formatted["cover_photo_url"] = page_data["cover"].get("source")
+        return formatted_data
+    
+    def _format_page_data(self, page_data: Dict) -> PageRecord:
+        """
+        🔥 CORRIGÉ: Formate les données de page SANS 'perms'
+        """
+        picture = page_data.get("picture")
+        cover = page_data.get("cover")
         
         # 🔥 CORRECTION: Utiliser 'tasks' au lieu de 'perms'
-        tasks = page_data.get("tasks", [])
-        formatted["tasks"] = tasks
+        tasks = page_data.get("tasks") or []
         
-        # Déterminer les permissions basées sur les tasks
-        formatted["is_admin"] = "ADMINISTER" in tasks or "MANAGE" in tasks
-        formatted["can_create_content"] = "CREATE_CONTENT" in tasks
-        formatted["can_moderate"] = "MODERATE_CONTENT" in tasks
+        # Déterminer les permissions basées sur les tasks (ensemble : tests O(1))
+        task_set = frozenset(tasks)
         
-        return formatted
+        return PageRecord(
+            id=page_data.get("id", ""),
+            name=page_data.get("name", "Page sans nom"),
+            category=page_data.get("category"),
+            fan_count=page_data.get("fan_count", 0),
+            about=page_data.get("about"),
+            access_token=page_data.get("access_token", ""),
+            profile_pic_url=picture["data"].get("url") if picture and "data" in picture else None,
+            cover_photo_url=cover.get("source") if cover else None,
+            tasks=tasks,
+            is_admin=not task_set.isdisjoint(_ADMIN_TASKS),
+            can_create_content="CREATE_CONTENT" in task_set,
+            can_moderate="MODERATE_CONTENT" in task_set,
+        )
     
     def _parse_facebook_error(self, response: httpx.Response) -> Dict[str, Any]:
         """
@@ -295,15 +437,16 @@ class FacebookAuthService:
         """
         try:
             if response.content:
-                content = response.json()
+                content = _json(response)
                 error_data = content.get("error", {})
-                logger.error(f"📛 Facebook API Error: {json.dumps(error_data, indent=2)}")
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error("📛 Facebook API Error: %s", json.dumps(error_data, indent=2))
                 return error_data
         except Exception as e:
-            logger.error(f"❌ Erreur parsing erreur Facebook: {e}")
+            logger.error("❌ Erreur parsing erreur Facebook: %s", e)
         
         return {
-            "message": f"HTTP {response.status_code}: {response.text[:200]}",
+            "message": f"HTTP {response.status_code}: {response.content[:200].decode('utf-8', errors='replace')}",
             "code": response.status_code
         }
     
@@ -311,7 +454,7 @@ class FacebookAuthService:
         """
         🔥 CORRIGÉ: Calcule la date d'expiration
         """
-        return datetime.utcnow() + timedelta(seconds=expires_in)
+        return datetime.fromtimestamp(time.time() + expires_in, tz=timezone.utc)
     
     async def test_connection(self) -> bool:
         """
@@ -322,14 +465,15 @@ class FacebookAuthService:
             response = await self.client.get(test_url, timeout=10.0)
             return response.status_code == 200
         except Exception as e:
-            logger.error(f"❌ Test connexion Facebook échoué: {e}")
+            logger.error("❌ Test connexion Facebook échoué: %s", e)
             return False
     
     async def close(self):
         """
-        Fermer le client HTTP
+        Fermer le client HTTP (le client partagé reste ouvert pour les autres services)
         """
-        await self.client.aclose()
+        if not is_shared_client(self.client):
+            await self.client.aclose()
 
 
 # 🔥 Instance avec meilleure gestion d'erreur
@@ -337,24 +481,29 @@ try:
     facebook_auth_service = FacebookAuthService()
     logger.info("🚀 FacebookAuthService initialisé avec succès")
 except Exception as e:
-    logger.critical(f"💥 ÉCHEC initialisation FacebookAuthService: {e}")
+    logger.critical("💥 ÉCHEC initialisation FacebookAuthService: %s", e)
+    
+    # Service en mode dégradé (l'erreur d'initialisation est connue une fois pour toutes)
+    _NOT_CONFIGURED = "Service Facebook non configuré. Vérifiez les variables d'environnement."
     
-    # Service en mode dégradé
     class DegradedFacebookAuthService:
         def __init__(self):
             self.app_id = "NOT_CONFIGURED"
             logger.error("⚠️ Service Facebook en mode dégradé")
         
         def get_oauth_url(self, state=None):
-            raise Exception("Service Facebook non configuré. Vérifiez les variables d'environnement.")
+            raise Exception(_NOT_CONFIGURED)
         
         async def exchange_code_for_token(self, code):
-            raise Exception("Service Facebook non configuré. Vérifiez les variables d'environnement.")
+            raise Exception(_NOT_CONFIGURED)
         
         async def get_user_info(self, access_token):
-            raise Exception("Service Facebook non configuré.")
+            raise Exception(_NOT_CONFIGURED)
         
         async def get_user_pages(self, user_access_token):
-            raise Exception("Service Facebook non configuré.")
+            raise Exception(_NOT_CONFIGURED)
+        
+        async def get_user_info_and_pages(self, access_token):
+            raise Exception(_NOT_CONFIGURED)
     
     facebook_auth_service = DegradedFacebookAuthService()
\ No newline at end of file
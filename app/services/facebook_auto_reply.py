@@ -1,22 +1,280 @@
+import asyncio
+import json
 import logging
+import os
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple
+from urllib.parse import urlencode
 from sqlalchemy.orm import Session
-import aiohttp
+import httpx
 
+from app.db import SessionLocal
 from app.models.facebook import FacebookComment, FacebookPage
 from app.models.order import Order
 from app.services.order_service import OrderService
+from app.services.facebook_http import get_shared_client
 
 logger = logging.getLogger(__name__)
 
+# Token de page par vendeur : évite une requête SQL par commentaire traité
+SELLER_TOKEN_TTL = 300
+_SELLER_TOKEN_CACHE_MAX = 10_000
+_seller_tokens: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+def invalidate_seller_token(seller_id: uuid.UUID) -> None:
+    """Oublie le token mis en cache d'un vendeur (pages resynchronisées, sélection, déconnexion)"""
+    _seller_tokens.pop(str(seller_id), None)
+
+GRAPH_REPLY_URL = "https://graph.facebook.com/v19.0"
+
+# Regroupement des réponses (API batch, 50 appels max par requête), désactivé
+# par défaut : FACEBOOK_REPLY_BATCH_DELAY=1.0 pour regrouper pendant les Lives
+REPLY_BATCH_DELAY = float(os.getenv("FACEBOOK_REPLY_BATCH_DELAY", "0"))
+REPLY_BATCH_MAX = 50
+
+# Appels Graph API simultanés (sous la limite de débit de l'application)
+FB_MAX_CONCURRENT_CALLS = int(os.getenv("FACEBOOK_MAX_CONCURRENT_CALLS", "50"))
+_FB_SEMAPHORE = asyncio.Semaphore(FB_MAX_CONCURRENT_CALLS)
+
+async def _post_reply(
+    client: httpx.AsyncClient,
+    comment_id: str,
+    message: str,
+    page_access_token: str
+) -> Dict[str, Any]:
+    """Publie une réponse à un commentaire (une requête)"""
+    async with _FB_SEMAPHORE:
+        response = await client.post(
+            f"{GRAPH_REPLY_URL}/{comment_id}/comments",
+            data={"message": message, "access_token": page_access_token}
+        )
+    result = response.json()
+    
+    logger.info("📨 Réponse Facebook API: %s - %s", response.status_code, result)
+    
+    if response.status_code != 200:
+        error_msg = result.get('error', {}).get('message', 'Unknown error')
+        logger.error("❌ Erreur Facebook API: %s", error_msg)
+        raise Exception(f"Facebook API error: {error_msg}")
+    return result
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    """Transmet le résultat à l'appelant (sauf s'il a abandonné l'attente)"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+class FacebookReplyBatchQueue:
+    """
+    File des réponses en attente, groupées par token de page : après `delay`
+    secondes (ou REPLY_BATCH_MAX réponses), chaque groupe part en une seule
+    requête batch Graph API et chaque appelant reçoit son propre résultat
+    """
+    
+    def __init__(self, delay: float = REPLY_BATCH_DELAY):
+        self.delay = delay
+        # token de page -> [(comment_id, message, future)]
+        self._pending: Dict[str, List[Tuple[str, str, asyncio.Future]]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        # Références des envois en cours (sinon collectables avant la fin)
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(
+        self,
+        client: httpx.AsyncClient,
+        comment_id: str,
+        message: str,
+        page_access_token: str
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        if self._loop is None or self._loop.is_closed():
+            self._loop = loop
+            self._pending = {}
+            self._flush_handle = None
+        elif self._loop is not loop:
+            # File liée à une autre boucle : envoi direct
+            return await _post_reply(client, comment_id, message, page_access_token)
+        
+        future = loop.create_future()
+        self._client = client
+        items = self._pending.setdefault(page_access_token, [])
+        items.append((comment_id, message, future))
+        
+        if len(items) >= REPLY_BATCH_MAX:
+            self._spawn(self._send(client, page_access_token, self._pending.pop(page_access_token)))
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.delay, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for page_access_token, items in pending.items():
+            self._spawn(self._send(self._client, page_access_token, items))
+    
+    def _spawn(self, coro) -> None:
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        page_access_token: str,
+        items: List[Tuple[str, str, asyncio.Future]]
+    ) -> None:
+        if len(items) == 1:
+            comment_id, message, future = items[0]
+            try:
+                _resolve(future, await _post_reply(client, comment_id, message, page_access_token))
+            except Exception as e:
+                _resolve(future, error=e)
+            return
+        
+        batch = json.dumps([
+            {
+                "method": "POST",
+                "relative_url": f"{comment_id}/comments",
+                "body": urlencode({"message": message})
+            }
+            for comment_id, message, _ in items
+        ])
+        
+        try:
+            async with _FB_SEMAPHORE:
+                response = await client.post(
+                    GRAPH_REPLY_URL,
+                    data={"access_token": page_access_token, "batch": batch, "include_headers": "false"}
+                )
+            parts = response.json()
+            if response.status_code != 200:
+                error_msg = parts.get('error', {}).get('message', 'Unknown error')
+                raise Exception(f"Facebook API error: {error_msg}")
+        except Exception as e:
+            for _, _, future in items:
+                _resolve(future, error=e)
+            return
+        
+        logger.info("📨 Lot de %s réponses Facebook envoyé", len(items))
+        for index, (_, _, future) in enumerate(items):
+            part = parts[index] if index < len(parts) else None
+            try:
+                if not part:
+                    raise Exception("Facebook API error: sous-requête non exécutée")
+                result = json.loads(part.get("body") or "{}")
+                if part.get("code") != 200:
+                    error_msg = result.get('error', {}).get('message', 'Unknown error')
+                    raise Exception(f"Facebook API error: {error_msg}")
+                _resolve(future, result)
+            except Exception as e:
+                _resolve(future, error=e)
+
+_reply_batch_queue = FacebookReplyBatchQueue()
+
+# Historique des réponses écrit en arrière-plan, par lots
+REPLY_HISTORY_FLUSH_SIZE = 50
+REPLY_HISTORY_FLUSH_INTERVAL = 0.1
+# Marqueur de fin de file (ReplyHistoryWriter.close)
+_STOP_WRITER = object()
+
+def _insert_reply_history(rows: List[Dict[str, Any]]) -> None:
+    """Insère un lot d'historiques (session dédiée, un seul commit)"""
+    from app.models.facebook_reply import FacebookReplyHistory
+    
+    with SessionLocal() as db:
+        db.add_all([FacebookReplyHistory(**row) for row in rows])
+        db.commit()
+
+class ReplyHistoryWriter:
+    """
+    File des historiques de réponses : une tâche consommatrice regroupe les
+    lignes (REPLY_HISTORY_FLUSH_SIZE max, ou après REPLY_HISTORY_FLUSH_INTERVAL
+    secondes) et les insère hors de la boucle, sans retarder la réponse
+    """
+    
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def put(self, row: Dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        await self._queue.put(row)
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await self._queue.get()
+            if row is _STOP_WRITER:
+                break
+            rows = [row]
+            deadline = loop.time() + REPLY_HISTORY_FLUSH_INTERVAL
+            while len(rows) < REPLY_HISTORY_FLUSH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP_WRITER:
+                    # Arrêt demandé : le lot en cours est écrit avant de sortir
+                    stopping = True
+                    break
+                rows.append(row)
+            await self._write(rows)
+    
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            await asyncio.to_thread(_insert_reply_history, rows)
+        except Exception as e:
+            logger.error("❌ Erreur enregistrement historique (%d réponses): %s", len(rows), e, exc_info=True)
+    
+    async def close(self) -> None:
+        """Écrit les lignes en attente (lot en cours compris) puis arrête la tâche"""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.put(_STOP_WRITER)
+            await self._task
+        # Lignes arrivées après la demande d'arrêt
+        rows = []
+        while not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not _STOP_WRITER:
+                rows.append(row)
+        if rows:
+            await self._write(rows)
+        self._task = None
+
+_reply_history_writer = ReplyHistoryWriter()
+
+async def close_reply_history_writer() -> None:
+    """À appeler à l'arrêt de l'application"""
+    await _reply_history_writer.close()
+
 class FacebookAutoReplyService:
     """Service pour les réponses automatiques Facebook"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, http_client: Optional[httpx.AsyncClient] = None):
         self.db = db
         self.order_service = OrderService(db)
+        # Client HTTP partagé (connexions keep-alive vers graph.facebook.com)
+        self.http_client = http_client or get_shared_client()
     
     def get_comment_by_id(self, comment_id: str, seller_id: uuid.UUID) -> Optional[FacebookComment]:
         """Récupère un commentaire par ID"""
@@ -34,6 +292,16 @@ class FacebookAutoReplyService:
     
     async def get_facebook_token_for_seller(self, seller_id: uuid.UUID) -> Optional[str]:
         """Récupère le token Facebook pour un vendeur - VERSION CORRIGÉE"""
+        key = str(seller_id)
+        cached = _seller_tokens.get(key)
+        if cached is not None:
+            expires, token = cached
+            if time.monotonic() < expires:
+                # LRU : le vendeur actif passe en fin de file d'éviction
+                _seller_tokens.move_to_end(key)
+                return token
+            _seller_tokens.pop(key, None)
+        
         try:
             # Chercher la page active/sélectionnée
             facebook_page = self.db.query(FacebookPage).filter(
@@ -45,43 +313,47 @@ class FacebookAutoReplyService:
             ).first()
             
             if facebook_page and facebook_page.page_access_token:
-                logger.info(f"✅ Token Facebook trouvé pour vendeur {seller_id}: {facebook_page.page_access_token[:30]}...")
+                logger.debug("✅ Token Facebook trouvé pour vendeur %s", seller_id)
+                _seller_tokens[key] = (time.monotonic() + SELLER_TOKEN_TTL, facebook_page.page_access_token)
+                if len(_seller_tokens) > _SELLER_TOKEN_CACHE_MAX:
+                    _seller_tokens.popitem(last=False)
                 return facebook_page.page_access_token
             
-            logger.warning(f"❌ Pas de token Facebook trouvé pour le vendeur {seller_id}")
+            logger.warning("❌ Pas de token Facebook trouvé pour le vendeur %s", seller_id)
             return None
             
         except Exception as e:
-            logger.error(f"Erreur récupération token Facebook: {e}", exc_info=True)
+            logger.error("Erreur récupération token Facebook: %s", e, exc_info=True)
             return None
     
+    # Réponses de confirmation (un seul .format() sur le modèle retenu)
+    REPLY_TEMPLATES = {
+        "order_created": (
+            "✅ Commande créée !\n\n"
+            "Merci {user_name} !\n"
+            "Votre commande **{order_number}** a été enregistrée.\n"
+            "Total : {total_amount}€\n\n"
+            "Nous vous contacterons en message privé pour finaliser la livraison. 📦\n\n"
+            "#LiveShopping #CommandeValidée"
+        ),
+        "order_with_items": (
+            "🎉 Commande prise en compte !\n\n"
+            "Merci {user_name} pour votre commande **{order_number}**.\n"
+            "Montant : {total_amount}€\n\n"
+            "Un message privé vous sera envoyé pour confirmer l'adresse de livraison.\n\n"
+            "Merci pour votre confiance ! 🙏"
+        ),
+        "needs_confirmation": (
+            "👋 Nous avons bien reçu votre demande !\n\n"
+            "{user_name}, votre commande **{order_number}** est en attente de confirmation.\n"
+            "Veuillez vérifier vos messages privés pour finaliser.\n\n"
+            "Merci ! 😊"
+        )
+    }
+    
     def generate_order_confirmation_reply(self, order: Order, comment: FacebookComment) -> str:
         """Génère un message de confirmation automatique"""
         
-        templates = {
-            "order_created": (
-                "✅ Commande créée !\n\n"
-                f"Merci {comment.user_name} !\n"
-                f"Votre commande **{order.order_number}** a été enregistrée.\n"
-                f"Total : {order.total_amount}€\n\n"
-                "Nous vous contacterons en message privé pour finaliser la livraison. 📦\n\n"
-                "#LiveShopping #CommandeValidée"
-            ),
-            "order_with_items": (
-                "🎉 Commande prise en compte !\n\n"
-                f"Merci {comment.user_name} pour votre commande **{order.order_number}**.\n"
-                f"Montant : {order.total_amount}€\n\n"
-                "Un message privé vous sera envoyé pour confirmer l'adresse de livraison.\n\n"
-                "Merci pour votre confiance ! 🙏"
-            ),
-            "needs_confirmation": (
-                "👋 Nous avons bien reçu votre demande !\n\n"
-                f"{comment.user_name}, votre commande **{order.order_number}** est en attente de confirmation.\n"
-                "Veuillez vérifier vos messages privés pour finaliser.\n\n"
-                "Merci ! 😊"
-            )
-        }
-        
         # Choisir le template selon le nombre d'items
         if hasattr(order, 'items') and len(order.items) > 1:
             template = "order_with_items"
@@ -90,7 +362,11 @@ class FacebookAutoReplyService:
         else:
             template = "order_created"
         
-        return templates[template]
+        return self.REPLY_TEMPLATES[template].format(
+            user_name=comment.user_name,
+            order_number=order.order_number,
+            total_amount=order.total_amount
+        )
     
     async def send_facebook_reply(
         self, 
@@ -98,40 +374,32 @@ class FacebookAutoReplyService:
         message: str,
         page_access_token: str
     ) -> Dict[str, Any]:
-        """Envoie une réponse via l'API Facebook - VERSION TESTÉE"""
+        """
+        Envoie une réponse via l'API Facebook - VERSION TESTÉE
+        (regroupée avec les autres réponses de la page pendant
+        REPLY_BATCH_DELAY secondes si le regroupement est actif)
+        """
         
         try:
-            # URL de l'API Facebook pour répondre à un commentaire
-            url = f"https://graph.facebook.com/v19.0/{comment_id}/comments"
-            
-            data = {
-                "message": message,
-                "access_token": page_access_token
-            }
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("📤 Envoi réponse Facebook à %s...", comment_id[:10])
+                logger.info("Message: %s...", message[:50])
             
-            logger.info(f"📤 Envoi réponse Facebook à {comment_id[:10]}...")
-            logger.info(f"Message: {message[:50]}...")
-            logger.info(f"Token: {page_access_token[:20]}...")
+            if REPLY_BATCH_DELAY > 0:
+                result = await _reply_batch_queue.submit(
+                    self.http_client, comment_id, message, page_access_token
+                )
+            else:
+                result = await _post_reply(self.http_client, comment_id, message, page_access_token)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=data) as response:
-                    result = await response.json()
-                    
-                    logger.info(f"📨 Réponse Facebook API: {response.status} - {result}")
-                    
-                    if response.status != 200:
-                        error_msg = result.get('error', {}).get('message', 'Unknown error')
-                        logger.error(f"❌ Erreur Facebook API: {error_msg}")
-                        raise Exception(f"Facebook API error: {error_msg}")
-                    
-                    logger.info(f"✅ Réponse Facebook envoyée avec ID: {result.get('id')}")
-                    return result
+            logger.info("✅ Réponse Facebook envoyée avec ID: %s", result.get('id'))
+            return result
                     
-        except aiohttp.ClientError as e:
-            logger.error(f"❌ Erreur réseau Facebook: {e}")
+        except httpx.RequestError as e:
+            logger.error("❌ Erreur réseau Facebook: %s", e)
             raise
         except Exception as e:
-            logger.error(f"❌ Erreur envoi réponse Facebook: {e}")
+            logger.error("❌ Erreur envoi réponse Facebook: %s", e)
             raise
     
     def save_reply_history(
@@ -158,6 +426,23 @@ class FacebookAutoReplyService:
         
         return reply_history
     
+    async def _save_reply_history_async(
+        self,
+        comment_id: str,
+        order_id: uuid.UUID,
+        message: str,
+        facebook_response_id: Optional[str] = None
+    ) -> None:
+        """Met l'historique en file : écrit en arrière-plan par ReplyHistoryWriter"""
+        await _reply_history_writer.put({
+            "id": uuid.uuid4(),
+            "comment_id": comment_id,
+            "order_id": order_id,
+            "message": message,
+            "facebook_response_id": facebook_response_id,
+            "sent_at": datetime.utcnow(),
+        })
+    
     def get_reply_history(self, comment_id: str, seller_id: uuid.UUID) -> List[Dict[str, Any]]:
         """Récupère l'historique des réponses"""
         
@@ -191,10 +476,10 @@ class FacebookAutoReplyService:
         try:
             comment = self.get_comment_by_id(comment_id, seller_id)
             if not comment:
-                logger.error(f"❌ Commentaire non trouvé: {comment_id}")
+                logger.error("❌ Commentaire non trouvé: %s", comment_id)
                 return None
             
-            logger.info(f"📝 Création commande depuis commentaire: {comment_id}")
+            logger.info("📝 Création commande depuis commentaire: %s", comment_id)
             
             # Utiliser le service existant pour créer la commande
             order = self.order_service.create_order_from_facebook_comment(
@@ -206,14 +491,14 @@ class FacebookAutoReplyService:
             )
             
             if order:
-                logger.info(f"✅ Commande créée: {order.order_number}")
+                logger.info("✅ Commande créée: %s", order.order_number)
             else:
-                logger.error(f"❌ Échec création commande pour commentaire {comment_id}")
+                logger.error("❌ Échec création commande pour commentaire %s", comment_id)
             
             return order
             
         except Exception as e:
-            logger.error(f"❌ Erreur création commande: {e}", exc_info=True)
+            logger.error("❌ Erreur création commande: %s", e, exc_info=True)
             return None
     
     async def auto_reply_after_order(
@@ -225,7 +510,7 @@ class FacebookAutoReplyService:
     ) -> Dict[str, Any]:
         """Répond automatiquement après création de commande - VERSION COMPLÈTE"""
         try:
-            logger.info(f"🔄 Début auto-reply pour commentaire: {comment_id}")
+            logger.info("🔄 Début auto-reply pour commentaire: %s", comment_id)
             
             # Récupérer le token si non fourni
             if not facebook_token:
@@ -245,24 +530,29 @@ class FacebookAutoReplyService:
             
             # Générer le message
             reply_message = self.generate_order_confirmation_reply(order, comment)
-            logger.info(f"📄 Message généré: {reply_message[:100]}...")
+            logger.info("📄 Message généré: %s...", reply_message[:100])
             
             # Envoyer la réponse
-            result = await self.send_facebook_reply(
-                comment_id=comment_id,
-                message=reply_message,
-                page_access_token=facebook_token
-            )
+            try:
+                result = await self.send_facebook_reply(
+                    comment_id=comment_id,
+                    message=reply_message,
+                    page_access_token=facebook_token
+                )
+            except Exception:
+                # Token peut-être révoqué hors de l'application : relu en base au prochain appel
+                invalidate_seller_token(seller_id)
+                raise
             
-            # Enregistrer l'historique
-            self.save_reply_history(
+            # Enregistrer l'historique (en arrière-plan)
+            await self._save_reply_history_async(
                 comment_id=comment_id,
                 order_id=order.id,
                 message=reply_message,
                 facebook_response_id=result.get("id")
             )
             
-            logger.info(f"✅ Auto-reply terminé avec succès pour {order.order_number}")
+            logger.info("✅ Auto-reply terminé avec succès pour %s", order.order_number)
             
             return {
                 "success": True,
@@ -273,7 +563,7 @@ class FacebookAutoReplyService:
             }
                 
         except Exception as e:
-            logger.error(f"❌ Erreur auto-reply: {e}", exc_info=True)
+            logger.error("❌ Erreur auto-reply: %s", e, exc_info=True)
             return {
                 "success": False,
                 "error": str(e),
@@ -287,7 +577,7 @@ class FacebookAutoReplyService:
     ) -> Dict[str, Any]:
         """Processus complet: crée la commande et répond automatiquement"""
         try:
-            logger.info(f"🚀 Traitement automatique du commentaire: {comment_id}")
+            logger.info("🚀 Traitement automatique du commentaire: %s", comment_id)
             
             # 1. Créer la commande
             order = await self.create_order_from_comment(comment_id, seller_id)
@@ -310,5 +600,5 @@ class FacebookAutoReplyService:
             return result
             
         except Exception as e:
-            logger.error(f"❌ Erreur traitement automatique: {e}", exc_info=True)
+            logger.error("❌ Erreur traitement automatique: %s", e, exc_info=True)
             return {"success": False, "error": str(e)}
\ No newline at end of file
@@ -2,13 +2,23 @@
 import httpx
 import logging
 import asyncio
+import hashlib
 import json
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
 
+from app.services.facebook_http import get_shared_client, is_shared_client
+
 logger = logging.getLogger(__name__)
 
+# Cache des résultats de debug_token (TTL en secondes, nombre d'entrées)
+DEBUG_TOKEN_CACHE_TTL = 60
+DEBUG_TOKEN_CACHE_SIZE = 4096
+
 class FacebookGraphAPIService:
     """
     🔥 SERVICE COMPLET CORRIGÉ pour l'API Graph Facebook
@@ -16,30 +26,33 @@ class FacebookGraphAPIService:
     Avec gestion robuste des erreurs et retry automatique
     """
     
-    def __init__(self, api_version: str = "v18.0", timeout: int = 30):
+    def __init__(self, api_version: str = "v18.0", timeout: int = 30, client: Optional[httpx.AsyncClient] = None):
         self.base_url = f"https://graph.facebook.com/{api_version}"
         self.timeout = timeout
-        self.client = None
+        self.client = client
         self.rate_limit_remaining = 100  # Estimation
         self.last_request_time = None
+        # Cache debug_token : empreinte -> (échéance monotonic, résultat)
+        self._debug_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
         
         logger.info(f"🚀 FacebookGraphAPIService initialisé (v{api_version})")
     
     async def _ensure_client(self):
-        """Crée ou recrée le client HTTP si nécessaire"""
+        """Utilise le client HTTP partagé si aucun client (ouvert) n'est fourni"""
         if self.client is None or self.client.is_closed:
-            transport = httpx.AsyncHTTPTransport(retries=3)
-            self.client = httpx.AsyncClient(
-                timeout=self.timeout,
-                transport=transport,
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-            )
+            self.client = get_shared_client()
+    
+    @asynccontextmanager
+    async def _session(self):
+        """Client HTTP partagé pour un bloc `async with` (non fermé en sortie)"""
+        await self._ensure_client()
+        yield self.client
     
     async def close(self):
-        """Ferme proprement le client"""
-        if self.client and not self.client.is_closed:
+        """Ferme proprement le client (le client partagé reste ouvert pour les autres services)"""
+        if self.client and not self.client.is_closed and not is_shared_client(self.client):
             await self.client.aclose()
-            self.client = None
+        self.client = None
     
     async def __aenter__(self):
         await self._ensure_client()
@@ -106,27 +119,31 @@ class FacebookGraphAPIService:
                     response = await self.client.get(
                         url, 
                         params=request_params, 
-                        headers=default_headers
+                        headers=default_headers,
+                        timeout=self.timeout
                     )
                 elif method.upper() == "POST":
                     response = await self.client.post(
                         url, 
                         params=request_params,
                         json=data if data else None,
-                        headers=default_headers
+                        headers=default_headers,
+                        timeout=self.timeout
                     )
                 elif method.upper() == "DELETE":
                     response = await self.client.delete(
                         url, 
                         params=request_params,
-                        headers=default_headers
+                        headers=default_headers,
+                        timeout=self.timeout
                     )
                 elif method.upper() == "PUT":
                     response = await self.client.put(
                         url,
                         params=request_params,
                         json=data if data else None,
-                        headers=default_headers
+                        headers=default_headers,
+                        timeout=self.timeout
                     )
                 else:
                     raise ValueError(f"Méthode non supportée: {method}")
@@ -297,13 +314,13 @@ class FacebookGraphAPIService:
                 "subscribed_fields": ",".join(fields)
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self._session() as client:
                 response = await client.post(url, params=params)
                 
                 logger.info(f"📤 Webhook subscription HTTP: {response.status_code}")
                 
                 if response.status_code != 200:
-                    error_text = response.text[:500]
+                    error_text = response.content[:500].decode("utf-8", errors="replace")
                     logger.error(f"❌ Webhook subscription error: {error_text}")
                     return {
                         "success": False,
@@ -408,14 +425,14 @@ class FacebookGraphAPIService:
             logger.info(f"   Fields: {fields}")
             
             # Faire la requête
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self._session() as client:
                 url = f"https://graph.facebook.com/v18.0/{page_id}/posts"
                 response = await client.get(url, params=params)
                 
                 logger.info(f"📥 HTTP Status: {response.status_code}")
                 
                 if response.status_code != 200:
-                    error_text = response.text[:500]
+                    error_text = response.content[:500].decode("utf-8", errors="replace")
                     logger.error(f"❌ Facebook API Error: {error_text}")
                     return [], {}
                 
@@ -451,7 +468,7 @@ class FacebookGraphAPIService:
         car les champs .summary() sont dépréciés dans la requête principale
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self._session() as client:
                 # Récupérer les likes
                 likes_url = f"https://graph.facebook.com/v18.0/{post_id}/likes"
                 likes_params = {
@@ -536,14 +553,14 @@ class FacebookGraphAPIService:
             logger.info(f"🔍 Récupération commentaires post {post_id}")
             
             # Faire la requête directement
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self._session() as client:
                 url = f"https://graph.facebook.com/v18.0/{post_id}/comments"
                 response = await client.get(url, params=params)
                 
                 logger.info(f"📥 Commentaires HTTP Status: {response.status_code}")
                 
                 if response.status_code != 200:
-                    error_text = response.text[:200]
+                    error_text = response.content[:200].decode("utf-8", errors="replace")
                     logger.error(f"❌ Facebook API Error (comments): {error_text}")
                     return [], {}
                 
@@ -659,26 +676,46 @@ class FacebookGraphAPIService:
             logger.error(f"❌ Erreur récupération pages: {e}")
             return []
     
+    @staticmethod
+    def _debug_cache_key(input_token: str, app_id: str) -> bytes:
+        # Empreinte plutôt que le token en clair dans le cache
+        return hashlib.blake2b(f"{app_id}|{input_token}".encode(), digest_size=16).digest()
+    
+    def invalidate_debug_token(self, input_token: str, app_id: str) -> None:
+        """Retire un token du cache debug_token (ex: token révoqué ou renouvelé)"""
+        self._debug_cache.pop(self._debug_cache_key(input_token, app_id), None)
+    
     async def debug_token(self, input_token: str, app_id: str, app_secret: str) -> Dict[str, Any]:
         """
         🔥 Débogue un token Facebook
-        """
+        (résultat mis en cache au plus DEBUG_TOKEN_CACHE_TTL secondes,
+        sans dépasser l'expiration du token)
+        """
+        key = self._debug_cache_key(input_token, app_id)
+        cached = self._debug_cache.get(key)
+        if cached is not None:
+            expires, info = cached
+            if time.monotonic() < expires:
+                self._debug_cache.move_to_end(key)
+                return dict(info)
+            del self._debug_cache[key]
+        
         try:
             app_token = f"{app_id}|{app_secret}"
             
-            async with httpx.AsyncClient() as client:
+            async with self._session() as client:
                 url = f"https://graph.facebook.com/v18.0/debug_token"
                 params = {
                     "input_token": input_token,
                     "access_token": app_token
                 }
                 
-                response = await client.get(url, params=params)
+                response = await client.get(url, params=params, timeout=self.timeout)
                 result = response.json()
                 
                 data = result.get("data", {})
                 
-                return {
+                info = {
                     "is_valid": data.get("is_valid", False),
                     "user_id": data.get("user_id"),
                     "app_id": data.get("app_id"),
@@ -691,6 +728,16 @@ class FacebookGraphAPIService:
         except Exception as e:
             logger.error(f"❌ Erreur debug_token: {e}")
             return {"is_valid": False, "error": str(e)}
+        
+        ttl = DEBUG_TOKEN_CACHE_TTL
+        if info["expires_at"]:
+            ttl = min(ttl, info["expires_at"] - time.time())
+        if ttl > 0:
+            self._debug_cache[key] = (time.monotonic() + ttl, info)
+            if len(self._debug_cache) > DEBUG_TOKEN_CACHE_SIZE:
+                self._debug_cache.popitem(last=False)
+        
+        return dict(info)
     
     async def get_page_info(
         self, 
@@ -0,0 +1,65 @@
+# app/services/facebook_http.py
+import httpx
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 (multiplexage des appels parallèles sur une connexion) si h2 est installé
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Client HTTP partagé par les services Facebook (un seul pool de connexions
+# keep-alive vers graph.facebook.com par processus)
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Retourne le client HTTP partagé, créé au premier appel
+    (ou recréé s'il a été fermé)
+    """
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            # Limites portées par le transport (ignorées par le client quand
+            # un transport est fourni)
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=100,
+                    max_connections=1000,
+                    # Inférieur au délai keep-alive côté Facebook : évite de
+                    # réutiliser une connexion déjà fermée par le serveur
+                    keepalive_expiry=30.0
+                )
+            ),
+            headers={
+                'User-Agent': 'LiveCommerceApp/1.0',
+                'Accept': 'application/json',
+            }
+        )
+        if HTTP2_AVAILABLE:
+            logger.info("🌐 Client HTTP Facebook créé (HTTP/2 activé)")
+        else:
+            logger.warning("⚠️ h2 non installé : client HTTP Facebook en HTTP/1.1 (pip install 'httpx[http2]')")
+    return _shared_client
+
+
+def is_shared_client(client: Optional[httpx.AsyncClient]) -> bool:
+    """Indique si `client` est le client partagé (à ne pas fermer par un service)"""
+    return client is not None and client is _shared_client
+
+
+async def close_shared_client() -> None:
+    """Ferme le client partagé (arrêt de l'application)"""
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+        logger.info("🔌 Client HTTP Facebook partagé fermé")
+    _shared_client = None
@@ -3,7 +3,9 @@ import logging
 import uuid
 import json
 import time
-from datetime import datetime, timedelta
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.orm import Session
 import aiohttp
@@ -18,6 +20,31 @@ from app.models.user import User  # Si tu as un modèle User
 
 logger = logging.getLogger(__name__)
 
+# Tokens de page dont les permissions Messenger ont été vérifiées :
+# empreinte -> échéance (time.monotonic), pour éviter un appel Graph à chaque envoi
+VERIFIED_TOKEN_TTL = 600
+TOKEN_EXPIRY_SKEW = timedelta(minutes=5)
+_VERIFIED_TOKENS_MAX = 1024
+_verified_tokens: "OrderedDict[bytes, float]" = OrderedDict()
+
+def _token_key(page_token: str) -> bytes:
+    return hashlib.blake2b(page_token.encode(), digest_size=16).digest()
+
+def _remember_verified_token(key: bytes, known_expires_at: Optional[datetime]) -> None:
+    """Mémorise un token vérifié, sans dépasser son expiration connue (moins la marge)"""
+    ttl = VERIFIED_TOKEN_TTL
+    if known_expires_at is not None:
+        if known_expires_at.tzinfo is None:
+            known_expires_at = known_expires_at.replace(tzinfo=timezone.utc)
+        remaining = known_expires_at - TOKEN_EXPIRY_SKEW - datetime.now(timezone.utc)
+        ttl = min(ttl, remaining.total_seconds())
+    if ttl <= 0:
+        return
+    _verified_tokens[key] = time.monotonic() + ttl
+    _verified_tokens.move_to_end(key)
+    if len(_verified_tokens) > _VERIFIED_TOKENS_MAX:
+        _verified_tokens.popitem(last=False)
+
 class FacebookMessengerService:
     """Service complet pour Facebook Messenger"""
     
@@ -100,7 +127,9 @@ class FacebookMessengerService:
             if page and page.page_access_token:
                 # Vérifier que le token a les permissions Messenger
                 token = page.page_access_token
-                has_permissions = await self._check_messenger_permissions(token)
+                has_permissions = await self._check_messenger_permissions(
+                    token, known_expires_at=page.token_expires_at
+                )
                 
                 if has_permissions:
                     logger.info(f"✅ Token Messenger valide pour vendeur {seller_id}")
@@ -115,8 +144,23 @@ class FacebookMessengerService:
             logger.error(f"❌ Erreur récupération token Messenger: {e}")
             return None
     
-    async def _check_messenger_permissions(self, page_token: str) -> bool:
-        """Vérifie si le token a les permissions Messenger"""
+    async def _check_messenger_permissions(
+        self,
+        page_token: str,
+        known_expires_at: Optional[datetime] = None
+    ) -> bool:
+        """
+        Vérifie si le token a les permissions Messenger
+        (résultat positif réutilisé VERIFIED_TOKEN_TTL secondes, sans appel
+        Graph, tant que le token n'approche pas de known_expires_at)
+        """
+        key = _token_key(page_token)
+        deadline = _verified_tokens.get(key)
+        if deadline is not None:
+            if time.monotonic() < deadline:
+                return True
+            _verified_tokens.pop(key, None)
+        
         try:
             url = f"https://graph.facebook.com/v19.0/me/permissions"
             params = {"access_token": page_token}
@@ -131,7 +175,9 @@ class FacebookMessengerService:
                         required_permissions = {"pages_messaging", "pages_manage_metadata"}
                         granted_permissions = {p["permission"] for p in permissions if p["status"] == "granted"}
                         
-                        return required_permissions.issubset(granted_permissions)
+                        if required_permissions.issubset(granted_permissions):
+                            _remember_verified_token(key, known_expires_at)
+                            return True
             
             return False
             
@@ -6,6 +6,9 @@ import logging
 logger = logging.getLogger(__name__)
 
 class FormParserService:
+    # Attributs fixés à l'initialisation : pas de __dict__ par instance
+    __slots__ = ("config", "form_templates")
+    
     def __init__(self, config):
         self.config = config
         self.form_templates = self._load_form_templates()
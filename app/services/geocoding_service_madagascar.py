@@ -568,6 +568,14 @@ class GeocodingServiceMadagascar:
             self.metrics['avg_response_time'] += response_time
             logger.debug(f"Géocodage terminé en {response_time*1000:.2f}ms")
     
+    def batch_extract(self, addresses: List[str]) -> List[str]:
+        """
+        Géocode plusieurs adresses en un appel (même ordre que `addresses`).
+        Nominatim n'a pas d'endpoint batch : chaque adresse passe par le cache
+        puis par extract_zone_from_address, le rate limit reste respecté.
+        """
+        return [self.extract_zone_from_address(address) for address in addresses]
+    
     def _detect_by_postal_code(self, address: str) -> Optional[str]:
         """Détecte la zone par code postal malgache"""
         # Recherche des codes postaux format 3 chiffres (101-999)
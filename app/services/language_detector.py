@@ -6,6 +6,9 @@ import logging
 logger = logging.getLogger(__name__)
 
 class LanguageDetectorService:
+    # Attributs fixés à l'initialisation : pas de __dict__ par instance
+    __slots__ = ("config", "supported_languages", "lang_code_map", "lang_characteristics")
+    
     def __init__(self, config):
         self.config = config
         self.supported_languages = config.get("PADDLE_OCR_LANGS", ["fr", "en", "mg"])
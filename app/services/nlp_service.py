@@ -8,6 +8,13 @@ from langdetect.lang_detect_exception import LangDetectException
 logger = logging.getLogger(__name__)
 
 class NLPService:
+    # Attributs fixés à l'initialisation : pas de __dict__ par instance
+    __slots__ = (
+        "config", "phone_patterns", "email_pattern", "price_pattern",
+        "compiled_phone_patterns", "compiled_email_pattern", "compiled_price_pattern",
+        "malagasy_cities",
+    )
+    
     def __init__(self, config):
         self.config = config
         self.phone_patterns = config.get("NER_PHONE_PATTERNS", [])
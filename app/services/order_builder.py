@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 import logging
 import uuid
 import re
@@ -59,7 +59,13 @@ class ClientInfo:
             self.address = {}
 
 class OrderBuilderService:
-    def __init__(self, config: Dict[str, Any]):
+    # Attributs fixés à l'initialisation : pas de __dict__ par instance
+    __slots__ = (
+        "config", "product_database", "stock_service", "price_matching_threshold",
+        "delivery_patterns", "payment_patterns", "promotion_patterns",
+    )
+    
+    def __init__(self, config: Mapping[str, Any]):
         self.config = config
         self.product_database = config.get('product_database', {})
         self.stock_service = config.get('stock_service')
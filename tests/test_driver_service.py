@@ -0,0 +1,150 @@
+# tests/test_driver_service.py
+import asyncio
+import sys
+import uuid
+
+import pytest
+
+import app.services.driver_service  # noqa: F401
+
+driver_module = sys.modules["app.services.driver_service"]
+
+
+@pytest.fixture
+def geocoded(monkeypatch):
+    batches = []
+    
+    async def record(batch):
+        batches.append(list(batch))
+    
+    monkeypatch.setattr(driver_module, "_geocode_batch", record)
+    monkeypatch.setattr(driver_module, "_geocode_worker", None)
+    monkeypatch.setattr(driver_module, "_geocode_queue", None)
+    return batches
+
+
+def test_close_geocode_worker_drains_in_flight_batch(geocoded):
+    drivers = [(uuid.uuid4(), f"{i} rue de Paris") for i in range(3)]
+    
+    async def run():
+        for driver_id, address in drivers:
+            driver_module._enqueue_geocoding(driver_id, address)
+        # Le worker a retiré les adresses de la file (fenêtre de regroupement en cours)
+        await asyncio.sleep(0.01)
+        assert driver_module._geocode_queue.empty() and not geocoded
+        worker = driver_module._geocode_worker
+        await driver_module.close_geocode_worker()
+        return worker
+    
+    worker = asyncio.run(run())
+    assert geocoded == [drivers]
+    assert worker.done() and not worker.cancelled()
+    assert driver_module._geocode_worker is None
+
+
+def test_close_geocode_worker_without_worker_is_noop(geocoded):
+    asyncio.run(driver_module.close_geocode_worker())
+    assert geocoded == []
+
+
+def _sql(stmt):
+    from sqlalchemy.dialects import postgresql
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_paginate_with_cursor_uses_keyset_without_offset():
+    from datetime import datetime
+    from sqlalchemy import select
+    
+    cursor = (datetime(2024, 1, 1), uuid.uuid4())
+    sql = _sql(driver_module._paginate(select(driver_module.Driver), 40, 20, cursor))
+    
+    assert "(drivers.created_at, drivers.id) < (" in sql
+    assert "ORDER BY drivers.created_at DESC, drivers.id DESC" in sql
+    assert "LIMIT" in sql and "OFFSET" not in sql
+
+
+def test_paginate_without_cursor_falls_back_to_offset():
+    from sqlalchemy import select
+    
+    sql = _sql(driver_module._paginate(select(driver_module.Driver), 40, 20, None))
+    assert "OFFSET" in sql and "drivers.id) <" not in sql
+    
+    sql = _sql(driver_module._paginate(select(driver_module.Driver), 0, 20, None))
+    assert "OFFSET" not in sql
+
+
+class FakeScalarSession:
+    """AsyncSession minimale : enregistre la requête passée à scalars()"""
+    
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+        self.committed = False
+        self.rolled_back = False
+    
+    async def scalars(self, stmt):
+        self.statements.append(stmt)
+        row = self.row
+        
+        class Result:
+            def one_or_none(self):
+                return row
+        
+        return Result()
+    
+    async def commit(self):
+        self.committed = True
+    
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def _toggle(db, action):
+    return asyncio.run(driver_module.DriverService.toggle_driver_status(
+        db, uuid.uuid4(), action, uuid.uuid4()
+    ))
+
+
+def test_toggle_driver_status_single_update_returning():
+    user = driver_module.User(email="livreur@example.com")
+    db = FakeScalarSession(user)
+    
+    result, message = _toggle(db, "suspend")
+    
+    assert result is user and message == "Livreur suspendu avec succès"
+    assert db.committed and not db.rolled_back
+    assert len(db.statements) == 1
+    sql = _sql(db.statements[0])
+    assert sql.startswith("WITH updated_driver AS")
+    assert "UPDATE drivers SET disponibilite=" in sql
+    assert "drivers.seller_id =" in sql
+    assert "RETURNING drivers.user_id" in sql
+    assert "UPDATE users SET" in sql and "RETURNING users." in sql
+    assert "deleted_" not in sql
+
+
+def test_toggle_driver_status_delete_rewrites_email_in_sql():
+    db = FakeScalarSession(driver_module.User(email="deleted_1_x@example.com"))
+    
+    _, message = _toggle(db, "delete")
+    
+    assert message == "Livreur supprimé avec succès"
+    sql = _sql(db.statements[0])
+    assert "email=(" in sql and "extract(" in sql.lower()
+
+
+def test_toggle_driver_status_unknown_driver_rolls_back():
+    db = FakeScalarSession(None)
+    
+    result, message = _toggle(db, "activate")
+    
+    assert result is None and message == "Livreur non trouvé"
+    assert db.rolled_back and not db.committed
+
+
+def test_toggle_driver_status_rejects_unknown_action():
+    db = FakeScalarSession(None)
+    
+    assert _toggle(db, "archive") == (None, "Action non valide")
+    assert db.statements == []
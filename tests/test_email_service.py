@@ -0,0 +1,72 @@
+# tests/test_email_service.py
+import sys
+from email import message_from_bytes, policy
+
+import pytest
+
+import app.services.email_service  # noqa: F401
+
+# `app.services.email_service` est masqué par l'instance du même nom (app/services/__init__.py)
+email_module = sys.modules["app.services.email_service"]
+
+
+class FakeSMTP:
+    """Connexion SMTP factice : enregistre les messages envoyés"""
+    
+    def __init__(self):
+        self.sent = []
+        self.resets = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def sendmail(self, from_addr, to_addr, data):
+        self.sent.append((from_addr, to_addr, data))
+    
+    def rset(self):
+        self.resets += 1
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    fake = FakeSMTP()
+    monkeypatch.setattr(email_module, "SMTP_POOL_ENABLED", False)
+    monkeypatch.setattr(email_module.EmailService, "_open_connection", lambda self, timeout=30: fake)
+    return fake
+
+
+@pytest.fixture
+def service():
+    config = email_module.SMTPConfig(
+        smtp_server="smtp.example.com",
+        smtp_port=587,
+        sender_email="bot@example.com",
+        sender_password="secret",
+        sender_name="Live Commerce",
+        from_email="bot@example.com",
+    )
+    return email_module.EmailService(config)
+
+
+def test_send_bulk_sets_one_to_header_per_recipient(smtp, service):
+    recipients = ["a@example.com", "Élodie <e@example.com>"]
+    results = service.send_bulk(recipients, "Promo", "<p>Bonjour</p>")
+    
+    assert results == {recipient: True for recipient in recipients}
+    for (from_addr, to_addr, data), recipient in zip(smtp.sent, recipients):
+        message = message_from_bytes(data, policy=policy.SMTP)
+        assert from_addr == "bot@example.com" and to_addr == recipient
+        assert message.get_all("To") == [recipient]
+        assert message["Subject"] == "Promo"
+
+
+def test_send_bulk_rejects_header_injection(smtp, service):
+    crafted = "victim@example.com\r\nBcc: everyone@example.com"
+    results = service.send_bulk([crafted, "ok@example.com"], "Promo", "<p>Bonjour</p>")
+    
+    assert results == {crafted: False, "ok@example.com": True}
+    assert [to_addr for _, to_addr, _ in smtp.sent] == ["ok@example.com"]
+    assert b"Bcc" not in smtp.sent[0][2]
@@ -0,0 +1,209 @@
+# tests/test_facebook_auto_reply.py
+import asyncio
+import json
+import sys
+import uuid
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+import app.services.facebook_auto_reply  # noqa: F401
+
+# `app.services` réexporte des instances du même nom que certains modules
+auto_reply = sys.modules["app.services.facebook_auto_reply"]
+
+
+class GraphRecorder:
+    """Faux Graph API : réponses individuelles et batch, requêtes enregistrées"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        form = parse_qs(request.content.decode())
+        if "batch" in form:
+            batch = json.loads(form["batch"][0])
+            self.calls.append(("batch", form["access_token"][0], len(batch)))
+            parts = []
+            for item in batch:
+                comment_id = item["relative_url"].split("/")[0]
+                if comment_id == "bad":
+                    parts.append({"code": 400, "body": json.dumps({"error": {"message": "nope"}})})
+                else:
+                    parts.append({"code": 200, "body": json.dumps({"id": f"r_{comment_id}"})})
+            return httpx.Response(200, json=parts)
+        self.calls.append(("single", form["access_token"][0], request.url.path))
+        return httpx.Response(200, json={"id": "solo"})
+
+
+@pytest.fixture
+def graph():
+    return GraphRecorder()
+
+
+@pytest.fixture
+def service(graph):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(graph))
+    return auto_reply.FacebookAutoReplyService(None, http_client=client)
+
+
+def test_batching_is_off_by_default(graph, service, monkeypatch):
+    monkeypatch.setattr(auto_reply, "REPLY_BATCH_DELAY", 0.0)
+    result = asyncio.run(service.send_facebook_reply("c1", "merci", "T1"))
+    assert result == {"id": "solo"}
+    assert graph.calls == [("single", "T1", "/v19.0/c1/comments")]
+
+
+def test_batch_queue_groups_replies_per_page_token(graph, service, monkeypatch):
+    monkeypatch.setattr(auto_reply, "REPLY_BATCH_DELAY", 0.05)
+    monkeypatch.setattr(auto_reply, "_reply_batch_queue", auto_reply.FacebookReplyBatchQueue(delay=0.05))
+    
+    async def run():
+        return await asyncio.gather(
+            *[service.send_facebook_reply(cid, "merci", "T1") for cid in ("a", "b", "bad")],
+            service.send_facebook_reply("z", "hello", "T2"),
+            return_exceptions=True
+        )
+    
+    a, b, bad, z = asyncio.run(run())
+    assert a == {"id": "r_a"} and b == {"id": "r_b"}
+    assert isinstance(bad, Exception) and "nope" in str(bad)
+    # Une seule réponse pour ce token : envoi direct
+    assert z == {"id": "solo"}
+    assert sorted(graph.calls) == [("batch", "T1", 3), ("single", "T2", "/v19.0/z/comments")]
+    assert not auto_reply._reply_batch_queue._tasks
+
+
+def test_batch_queue_splits_at_max_size(graph, service, monkeypatch):
+    monkeypatch.setattr(auto_reply, "REPLY_BATCH_DELAY", 0.05)
+    monkeypatch.setattr(auto_reply, "_reply_batch_queue", auto_reply.FacebookReplyBatchQueue(delay=0.05))
+    
+    async def run():
+        return await asyncio.gather(*[service.send_facebook_reply(f"c{i}", "m", "T3") for i in range(55)])
+    
+    results = asyncio.run(run())
+    assert len(results) == 55
+    assert graph.calls == [("batch", "T3", auto_reply.REPLY_BATCH_MAX), ("batch", "T3", 5)]
+
+
+@pytest.fixture
+def written(monkeypatch):
+    batches = []
+    monkeypatch.setattr(auto_reply, "_insert_reply_history", lambda rows: batches.append(list(rows)))
+    return batches
+
+
+def test_history_writer_batches_rows(written):
+    async def run():
+        writer = auto_reply.ReplyHistoryWriter()
+        for i in range(120):
+            await writer.put({"i": i})
+        await asyncio.sleep(0.3)
+        await writer.close()
+    
+    asyncio.run(run())
+    assert [len(batch) for batch in written] == [50, 50, 20]
+
+
+def test_history_writer_close_writes_in_flight_batch(written):
+    async def run():
+        writer = auto_reply.ReplyHistoryWriter()
+        for i in range(3):
+            await writer.put({"i": i})
+        # Laisser _run retirer les lignes de la file (lot en cours, pas encore écrit)
+        await asyncio.sleep(0.01)
+        assert writer._queue.empty() and not written
+        await writer.close()
+    
+    asyncio.run(run())
+    assert [row["i"] for batch in written for row in batch] == [0, 1, 2]
+
+
+def test_history_writer_close_without_rows_is_noop(written):
+    asyncio.run(auto_reply.ReplyHistoryWriter().close())
+    assert written == []
+
+
+class FakePageQuery:
+    """Remplace db.query(FacebookPage)...first() : une page par vendeur"""
+    
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.queries = []
+        self._seller_id = None
+    
+    def query(self, model):
+        return self
+    
+    def filter(self, *criteria):
+        # Premier critère : FacebookPage.seller_id == <uuid>
+        self._seller_id = criteria[0].right.value
+        return self
+    
+    def order_by(self, *clauses):
+        return self
+    
+    def first(self):
+        self.queries.append(self._seller_id)
+        token = self.tokens.get(self._seller_id)
+        return type("Page", (), {"page_access_token": token})() if token else None
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    cache = auto_reply.OrderedDict()
+    monkeypatch.setattr(auto_reply, "_seller_tokens", cache)
+    return cache
+
+
+def _token_service(db):
+    service = auto_reply.FacebookAutoReplyService.__new__(auto_reply.FacebookAutoReplyService)
+    service.db = db
+    return service
+
+
+def test_seller_token_is_cached(token_cache):
+    seller = uuid.uuid4()
+    db = FakePageQuery({seller: "PAGE_TOKEN"})
+    service = _token_service(db)
+    
+    assert asyncio.run(service.get_facebook_token_for_seller(seller)) == "PAGE_TOKEN"
+    assert asyncio.run(service.get_facebook_token_for_seller(seller)) == "PAGE_TOKEN"
+    assert db.queries == [seller]
+    
+    auto_reply.invalidate_seller_token(seller)
+    asyncio.run(service.get_facebook_token_for_seller(seller))
+    assert db.queries == [seller, seller]
+
+
+def test_seller_token_cache_evicts_least_recently_used(token_cache, monkeypatch):
+    monkeypatch.setattr(auto_reply, "_SELLER_TOKEN_CACHE_MAX", 2)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    service = _token_service(FakePageQuery({a: "A", b: "B", c: "C"}))
+    
+    async def run():
+        for seller in (a, b, a, c):
+            await service.get_facebook_token_for_seller(seller)
+    
+    asyncio.run(run())
+    # `a` relu juste avant l'ajout de `c` : c'est `b` qui est évincé
+    assert list(token_cache) == [str(a), str(c)]
+
+
+def test_failed_reply_invalidates_seller_token(token_cache, monkeypatch):
+    seller = uuid.uuid4()
+    token_cache[str(seller)] = (float("inf"), "REVOKED")
+    service = _token_service(None)
+    comment = type("Comment", (), {"user_name": "Jean"})()
+    order = type("Order", (), {"order_number": "CMD-1", "total_amount": 10, "id": uuid.uuid4()})()
+    
+    async def failing_reply(**kwargs):
+        raise Exception("Facebook API error: Error validating access token")
+    
+    monkeypatch.setattr(service, "get_comment_by_id", lambda comment_id, seller_id: comment, raising=False)
+    monkeypatch.setattr(service, "send_facebook_reply", failing_reply, raising=False)
+    
+    result = asyncio.run(service.auto_reply_after_order("c1", order, seller, facebook_token="REVOKED"))
+    assert result["success"] is False
+    assert str(seller) not in token_cache
@@ -0,0 +1,46 @@
+# tests/test_models.py
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.models.driver_model import Driver
+from app.models.seller import Seller
+from app.models.user import User
+from app.scripts import migrate_timestamp_defaults
+
+
+def _insert_sql(model, *columns):
+    """INSERT tel qu'émis par l'ORM quand seules `columns` sont renseignées"""
+    return str(model.__table__.insert().compile(
+        dialect=postgresql.dialect(),
+        column_keys=list(columns)
+    ))
+
+
+@pytest.mark.parametrize("model, columns", [
+    (User, ("full_name", "email", "role", "password")),
+    (Seller, ("user_id", "company_name")),
+    (Driver, ("user_id", "seller_id", "zone_livraison")),
+])
+def test_insert_stamps_timestamps_without_db_default(model, columns):
+    # Les bases non migrées n'ont pas de DEFAULT : now() doit figurer dans l'INSERT
+    sql = _insert_sql(model, *columns)
+    
+    assert "created_at, updated_at" in sql
+    assert sql.count("now()") == 2
+    assert "%(created_at)s" not in sql and "%(updated_at)s" not in sql
+
+
+def test_migration_creates_driver_indexes_if_missing():
+    statements = [
+        str(CreateIndex(index, if_not_exists=True).compile(dialect=postgresql.dialect()))
+        for table in migrate_timestamp_defaults._INDEXED_TABLES
+        for index in sorted(table.indexes, key=lambda i: i.name)
+    ]
+    
+    assert statements == [
+        "CREATE INDEX IF NOT EXISTS idx_drivers_seller_created ON drivers "
+        "(seller_id, created_at DESC, id DESC) INCLUDE (user_id, disponibilite, zone_livraison)",
+        "CREATE INDEX IF NOT EXISTS idx_drivers_seller_zone ON drivers (seller_id, zone_livraison)",
+    ]
+    assert "drivers" in migrate_timestamp_defaults._TIMESTAMP_TABLES
@@ -0,0 +1,125 @@
+# tests/test_report_schemas.py
+import json
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.reports import ReportResponse, ReportSection, TopProduct
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _report(sections, data):
+    now = datetime(2026, 1, 31)
+    return ReportResponse(
+        report_id="report_1",
+        generated_at=now,
+        period_start=datetime(2026, 1, 1),
+        period_end=now,
+        sections=sections,
+        data=data,
+    )
+
+
+def test_report_data_keeps_public_shape():
+    report = _report(
+        [ReportSection.PRODUCTS, ReportSection.SALES, ReportSection.INVENTORY, ReportSection.ENGAGEMENT],
+        {
+            "products": {"total": 2},
+            "sales": {"message": "Module de ventes à implémenter", "placeholder": True},
+        },
+    )
+    data = json.loads(report.model_dump_json())["data"]
+    
+    assert set(data) == {"products", "sales", "inventory", "engagement"}
+    assert data["products"]["total"] == 2
+    # Placeholder des ventes dans `data`, sections demandées sans données -> {}
+    assert data["sales"] == {"message": "Module de ventes à implémenter", "placeholder": True}
+    assert data["inventory"] == {} and data["engagement"] == {}
+
+
+def test_report_response_has_no_extra_fields():
+    report = _report([ReportSection.FACEBOOK], {"facebook": {"total_engagement": 3}})
+    dumped = jsonable_encoder(report)
+    
+    assert "sections_str" not in dumped
+    assert dumped["sections"] == ["facebook"]
+    assert dumped["metadata"] == {}
+    assert dumped["data"]["facebook"]["total_engagement"] == 3
+
+
+def test_sections_serialize_as_plain_values():
+    report = _report(["products", ReportSection.SALES], {})
+    expected = ["products", "sales"]
+    
+    # Même JSON qu'avec use_enum_values : des chaînes, jamais des noms d'enum
+    assert json.loads(report.model_dump_json())["sections"] == expected
+    assert report.model_dump(mode="json")["sections"] == expected
+    assert jsonable_encoder(report)["sections"] == expected
+    assert json.dumps(report.model_dump()["sections"]) == json.dumps(expected)
+
+
+def test_report_response_matches_pre_change_fixture():
+    # Fixture produite par le schéma d'avant ReportData (data: Dict[ReportSection, Any])
+    with open(FIXTURES / "report_generate_response.json", encoding="utf-8") as f:
+        expected = json.load(f)
+    
+    report = ReportResponse(
+        report_id="report_1769860800",
+        generated_at=datetime(2026, 1, 31, 12),
+        period_start=datetime(2026, 1, 1),
+        period_end=datetime(2026, 1, 31),
+        sections=["products", "facebook", "sales", "inventory"],
+        data={
+            "products": {
+                "total": 2,
+                "by_category": {
+                    "Vêtements": {"count": 2, "total_stock": 5, "total_value": Decimal("100.00")}
+                },
+                "stock_summary": {"total": 5, "average": 2.5, "min": 2, "max": 3},
+                "price_summary": {
+                    "total_value": Decimal("100.00"),
+                    "average": Decimal("15.00"),
+                    "min": Decimal("10.00"),
+                    "max": Decimal("20.00"),
+                },
+                "top_products": [
+                    TopProduct(id="p1", name="robe", score=60.0),
+                    TopProduct(id="p2", name="jupe", score=40.0),
+                ],
+            },
+            "facebook": {
+                "pages": [{
+                    "page_id": "123",
+                    "page_name": "Boutique",
+                    "posts": 1,
+                    "comments": 2,
+                    "messages": 1,
+                    "lives": 0,
+                    "engagement": 3,
+                    "top_post": {
+                        "id": "x",
+                        "facebook_post_id": "123_456",
+                        "message": "Nouveautés",
+                        "likes_count": 7,
+                    },
+                }],
+                "total_engagement": 3,
+                "posts_summary": {},
+                "comments_summary": {},
+            },
+            "sales": {"message": "Module de ventes à implémenter", "placeholder": True},
+        },
+        summary={"total_products": 2, "total_facebook_engagement": 3, "pages_analyzed": 1},
+    )
+    
+    assert json.loads(report.model_dump_json()) == expected
+    assert jsonable_encoder(report) == expected
+
+
+def test_report_data_passes_undeclared_keys_through():
+    report = _report([ReportSection.FACEBOOK], {"facebook": {"pages": [{"page_id": "1", "reach": 10}]}})
+    
+    assert jsonable_encoder(report)["data"]["facebook"] == {"pages": [{"page_id": "1", "reach": 10}]}
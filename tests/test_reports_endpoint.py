@@ -0,0 +1,79 @@
+# tests/test_reports_endpoint.py
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from app.api.v1.endpoints.reports import generate_report
+from app.models.product import Product
+from app.schemas.reports import ReportRequest
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+    
+    def filter(self, *criteria):
+        return self
+    
+    def all(self):
+        return self.rows
+
+
+class FakeDB:
+    """Session minimale : chaque query(Model) renvoie les lignes prévues pour ce modèle"""
+    
+    def __init__(self, rows_by_model):
+        self.rows_by_model = rows_by_model
+    
+    def query(self, model):
+        return FakeQuery(self.rows_by_model.get(model, []))
+
+
+class FakeSeller:
+    id = uuid.uuid4()
+
+
+def _product(name, category, price, stock):
+    return Product(
+        id=uuid.uuid4(), seller_id=FakeSeller.id, name=name, category_name=category,
+        code_article=name.upper(), price=Decimal(price), stock=stock,
+    )
+
+
+def _generate(products):
+    request = ReportRequest(
+        sections=["products"],
+        start_date=datetime(2026, 1, 1),
+        end_date=datetime(2026, 1, 31),
+    )
+    report = asyncio.run(generate_report(request, FakeSeller(), FakeDB({Product: products})))
+    return json.loads(report.model_dump_json())["data"]["products"]
+
+
+def test_products_section_reads_product_columns():
+    products = [
+        _product("robe", "Vêtements", "20.00", 3),
+        _product("sac", "Accessoires", "50.00", 2),
+        _product("jupe", "Vêtements", "10.00", 0),
+    ]
+    
+    section = _generate(products)
+    
+    assert section["total"] == 3
+    assert section["stock_summary"] == {"total": 5, "average": 5 / 3, "min": 0, "max": 3}
+    assert section["by_category"]["Vêtements"]["count"] == 2
+    assert section["by_category"]["Vêtements"]["total_stock"] == 3
+    assert section["by_category"]["Accessoires"]["total_stock"] == 2
+    # Classement par valeur du stock (prix × stock)
+    assert [(p["name"], p["score"]) for p in section["top_products"]] == [
+        ("sac", 100.0), ("robe", 60.0), ("jupe", 0.0)
+    ]
+
+
+def test_products_section_without_products():
+    section = _generate([])
+    
+    assert section["total"] == 0 and section["by_category"] == {}
+    assert section["top_products"] == []
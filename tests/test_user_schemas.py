@@ -0,0 +1,42 @@
+# tests/test_user_schemas.py
+import uuid
+from datetime import datetime
+
+from app.schemas.auth_schema import RegisterSchema
+from app.schemas.user import UserResponse
+
+
+def _user_row(**overrides):
+    now = datetime.now()
+    row = {
+        "id": uuid.uuid4(),
+        "full_name": "X",
+        "email": "x@example.com",
+        "telephone": "",
+        "adresse": "",
+        "role": "Client",
+        "statut": "actif",
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_register_accepts_one_character_name():
+    data = RegisterSchema(email="x@example.com", password="secret1", full_name="X")
+    assert data.full_name == "X"
+
+
+def test_user_response_accepts_what_register_stores():
+    response = UserResponse.model_validate(_user_row())
+    assert response.full_name == "X"
+    assert response.telephone == ""
+    assert response.adresse == ""
+
+
+def test_user_response_email_is_plain_output():
+    # Valeur déjà en base : pas de revalidation EmailStr en sortie
+    response = UserResponse.model_validate(_user_row(email="legacy@localhost"))
+    assert response.email == "legacy@localhost"